@@ -0,0 +1,69 @@
+# bench/bench_annotations.py
+# Caché de anotaciones de tipo (types.type_from_annotation) sobre un programa con muchas
+# firmas del estilo `integer[][]`: tasa de aciertos (types.annotation_stats) y tiempo del
+# checker con la caché vs. resolviendo cada anotación de nuevo. Verifica que los
+# diagnósticos sean idénticos.
+#
+# Uso: python bench/bench_annotations.py [funciones]     (default: 20000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+
+from semantics import checker as checker_module
+from semantics import types
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+
+ANNOTATIONS = ["integer", "integer[]", "integer[][]", "float[]", "string", "boolean[][]", "Punto", "Punto[]"]
+
+def generate(functions):
+    lines = ["class Punto { let x: integer; let y: integer; }"]
+    for i in range(functions):
+        a, b, r = (ANNOTATIONS[(i + k) % len(ANNOTATIONS)] for k in (0, 3, 5))
+        lines.append(f"function f{i}(a: {a}, b: {b}): {r} {{ let t: {a} = a; const u: {b} = b; return f{i}(t, u); }}")
+    return "\n".join(lines) + "\n"
+
+def uncached(base, dims=0):
+    elem = types.BUILTIN_TYPES.get(base)
+    return types.array_of(types.ClassType(base) if elem is None else elem, dims)
+
+def check(tree):
+    t0 = time.perf_counter()
+    checker = checker_module.SemanticChecker()
+    checker.visit(tree)
+    return time.perf_counter() - t0, [str(e) for e in checker.errors]
+
+def main():
+    functions = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = generate(functions)
+    _, tree, syn = CompilerSession(PREDICTION_TWO_STAGE).parse(InputStream(code))
+    if syn.has_errors:
+        print(syn.errors[0])
+        return 1
+    print(f"Programa: {functions} funciones, {functions * 5} anotaciones")
+
+    types.annotation_stats.hits = types.annotation_stats.misses = 0
+    _, cached_errors = check(tree)
+    print(f"Caché: {types.annotation_stats}")
+
+    # Mejor de 3, alternando, porque el tiempo del checker es ruidoso
+    t_cached = t_uncached = float("inf")
+    for _ in range(3):
+        t_cached = min(t_cached, check(tree)[0])
+        checker_module.type_from_annotation = uncached
+        try:
+            elapsed, uncached_errors = check(tree)
+            t_uncached = min(t_uncached, elapsed)
+        finally:
+            checker_module.type_from_annotation = types.type_from_annotation
+    print(f"Checker con caché {t_cached:.2f} s, sin caché {t_uncached:.2f} s")
+    same = cached_errors == uncached_errors
+    print(f"Diagnósticos idénticos: {'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
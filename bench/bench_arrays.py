@@ -0,0 +1,49 @@
+# bench/bench_arrays.py
+# Literales de arreglo grandes (tablas de datos): [1, 2, ..., n]. El checker clasifica los
+# elementos que son un solo token literal por su tipo de token, sin visitarlos; los demás
+# (identificadores, expresiones) pasan por el visitor. Mide parseo y chequeo por separado.
+#
+# Uso: python bench/bench_arrays.py [elementos ...]     (default: 1000000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+
+from semantics.checker import SemanticChecker
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+
+TABLES = {
+    "integer": ("integer", lambda i: str(i)),
+    "float": ("float", lambda i: f"{i}.5"),
+    "string": ("string", lambda i: f'"s{i}"'),
+    "10% ids": ("integer", lambda i: "a" if i % 10 == 0 else str(i)),
+}
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000000]
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+    print(f"{'tabla':10}{'elementos':>11}{'parseo (s)':>12}{'checker (s)':>13}  resultado")
+    failed = 0
+    for name, (type_name, elem) in TABLES.items():
+        for n in sizes:
+            code = (f"let a: integer = 1;\nlet xs: {type_name}[] = ["
+                    + ", ".join(elem(i) for i in range(n)) + "];\n")
+            t0 = time.perf_counter()
+            _, tree, syn = session.parse(InputStream(code))
+            t_parse = time.perf_counter() - t0
+            checker = SemanticChecker()
+            t0 = time.perf_counter()
+            checker.visit(tree)
+            t_check = time.perf_counter() - t0
+            errors = syn.errors + checker.errors
+            failed += bool(errors)
+            print(f"{name:10}{n:>11}{t_parse:>12.2f}{t_check:>13.2f}  {errors[0] if errors else 'OK'}")
+            del tree
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,49 @@
+# bench/bench_chains.py
+# Cadenas n-arias largas (a + a + ..., a == a == ..., p || p || ...): la gramática deja los
+# n operandos como hijos de un único nodo. Mide el tiempo del checker, que debe crecer en
+# forma lineal con n.
+#
+# Uso: python bench/bench_chains.py [términos ...]     (default: 1000 10000 100000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+
+from semantics.checker import SemanticChecker
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+
+CHAINS = {
+    "suma": ("integer", " + ", "a"),
+    "producto": ("float", " * ", "f"),
+    "igualdad": ("boolean", " == ", "a"),
+    "relacional": ("boolean", " < ", "a"),
+    "lógica": ("boolean", " || ", "p"),
+}
+PRELUDE = "let a: integer = 1;\nlet f: float = 1.5;\nlet p: boolean = true;\n"
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 100000]
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+    print(f"{'cadena':12}{'términos':>10}{'parseo (s)':>12}{'checker (s)':>13}  resultado")
+    failed = 0
+    for name, (type_name, op, operand) in CHAINS.items():
+        for n in sizes:
+            code = PRELUDE + f"let r: {type_name} = " + op.join([operand] * n) + ";\n"
+            t0 = time.perf_counter()
+            _, tree, syn = session.parse(InputStream(code))
+            t_parse = time.perf_counter() - t0
+            checker = SemanticChecker()
+            t0 = time.perf_counter()
+            checker.visit(tree)
+            t_check = time.perf_counter() - t0
+            errors = syn.errors + checker.errors
+            failed += bool(errors)
+            print(f"{name:12}{n:>10}{t_parse:>12.2f}{t_check:>13.2f}  {errors[0] if errors else 'OK'}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+# bench/bench_deep.py
+# Estrés de anidamiento: paréntesis y bloques anidados N niveles. El parser de ANTLR es
+# recursivo y necesita el límite alto que CompilerSession sube mientras parsea (desde
+# Python 3.11); el checker se corre con un
+# límite de recursión de solo 50 frames sobre el actual para mostrar que su pila es constante.
+#
+# Uso: python bench/bench_deep.py [profundidad ...]     (default: 100 1000 10000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+
+from semantics.checker import SemanticChecker
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+
+PROGRAMS = {
+    "paréntesis": lambda n: "let x: integer = " + "(" * n + "1" + ")" * n + ";\n",
+    "bloques": lambda n: "{ " * n + "let a: integer = 1;" + " }" * n + "\n",
+    "if anidados": lambda n: "let b: boolean = true;\n" + "if (b) { " * n + "print(1);" + " }" * n + "\n",
+    "arreglos": lambda n: "let m = " + "[" * n + "1" + "]" * n + ";\n",
+}
+
+def stack_depth():
+    frame, depth = sys._getframe(), 0
+    while frame is not None:
+        frame, depth = frame.f_back, depth + 1
+    return depth
+
+def check_shallow(tree):
+    """Corre el checker con un límite de recursión de stack_depth() + 50."""
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(stack_depth() + 50)
+    try:
+        checker = SemanticChecker()
+        checker.visit(tree)
+        return checker.errors
+    finally:
+        sys.setrecursionlimit(limit)
+
+def main():
+    depths = [int(a) for a in sys.argv[1:]] or [100, 1000, 10000]
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+    print(f"{'caso':14}{'niveles':>9}{'parseo (s)':>12}{'checker (s)':>13}  resultado")
+    failed = 0
+    for name, make in PROGRAMS.items():
+        for n in depths:
+            code = make(n)
+            t0 = time.perf_counter()
+            _, tree, syn = session.parse(InputStream(code))
+            t_parse = time.perf_counter() - t0
+            if syn.has_errors:
+                print(f"{name:14}{n:>9}{t_parse:>12.2f}{'-':>13}  {syn.errors[0]}")
+                failed += 1
+                continue
+            t0 = time.perf_counter()
+            try:
+                errors = check_shallow(tree)
+                status = "OK" if not errors else errors[0]
+            except RecursionError:
+                status = "RecursionError"
+                failed += 1
+            t_check = time.perf_counter() - t0
+            print(f"{name:14}{n:>9}{t_parse:>12.2f}{t_check:>13.2f}  {status}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+# bench/bench_dispatch.py
+# Microbenchmark del despacho del SemanticChecker: tabla por clase de nodo y terminales
+# de puntuación saltados por tipo de token (walker.StackVisitor) contra el despacho
+# anterior por accept() de ANTLR, con visitChildren visitando todos los hijos.
+# Solo se mide el checker; el parseo se hace una vez por programa.
+#
+# Uso: python bench/bench_dispatch.py [n_sentencias]     (default: 100000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics import dfacache
+from semantics.checker import SemanticChecker
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from corpus import generate_statements
+
+def _accept(visitor, node):
+    return node.accept(visitor)
+
+class AcceptDispatch(SemanticChecker):
+    """Despacho previo: accept() (hasattr sobre el visitante) en cada nodo."""
+    SKIP_TOKEN_TYPES = frozenset()
+
+    @classmethod
+    def _resolve_handler(cls, node_cls):
+        return _accept
+
+    def visitChildren(self, node):
+        res = None
+        for i in range(node.getChildCount()):
+            child = node.getChild(i)
+            r = (yield child) if hasattr(child, "accept") else None
+            if r is not None:
+                res = r
+        return res
+
+def best_of(checker_cls, tree, repeat):
+    best, errors = float("inf"), None
+    for _ in range(repeat):
+        checker = checker_cls()
+        t0 = time.perf_counter()
+        checker.visit(tree)
+        best = min(best, time.perf_counter() - t0)
+        errors = checker.errors
+    return best, errors
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dfacache.load()
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+
+    trees = []
+    for path in sorted((ROOT / "samples").glob("*.cps")):
+        _, tree, syn = session.parse(InputStream(path.read_text(encoding="utf-8")))
+        if not syn.has_errors:
+            trees.append(tree)
+    t0 = time.perf_counter()
+    _, big, syn = session.parse(InputStream(generate_statements(n, seed=1)))
+    print(f"Parseo de {n} sentencias: {time.perf_counter() - t0:.1f} s")
+    assert not syn.has_errors, syn.errors[:3]
+    dfacache.save()
+
+    mismatches = 0
+    rows = []
+    for name, group, repeat in (("samples/", trees, 50), (f"{n} sentencias", [big], 3)):
+        totals = {}
+        for cls in (AcceptDispatch, SemanticChecker):
+            totals[cls] = 0.0
+            for tree in group:
+                elapsed, _ = best_of(cls, tree, repeat)
+                totals[cls] += elapsed
+        for tree in group:
+            if best_of(AcceptDispatch, tree, 1)[1] != best_of(SemanticChecker, tree, 1)[1]:
+                mismatches += 1
+        rows.append((name, totals[AcceptDispatch], totals[SemanticChecker]))
+
+    print(f"\n{'programa':20}{'accept (s)':>12}{'tabla (s)':>12}{'speedup':>10}")
+    for name, old, new in rows:
+        print(f"{name:20}{old:>12.3f}{new:>12.3f}{old / new:>9.2f}x")
+    print(f"\nDiagnósticos distintos: {mismatches}")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
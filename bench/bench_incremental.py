@@ -0,0 +1,59 @@
+# bench/bench_incremental.py
+# Re-chequeo tras editar un archivo grande: compile() completo vs. IncrementalChecker, que
+# solo vuelve a chequear los cuerpos de funciones y métodos afectados. Ediciones: el
+# cuerpo de una función, una global nueva al final y el tipo de un campo de una clase.
+# Verifica que los diagnósticos sean idénticos.
+#
+# Uso: python bench/bench_incremental.py [unidades]     (default: 3000)
+import sys, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics import dfacache
+from semantics.incremental import IncrementalChecker
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from corpus import generate_program
+
+def timed(fn, code):
+    t0 = time.perf_counter()
+    result = fn(code)
+    return time.perf_counter() - t0, [str(e) for e in result.errors]
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    code = generate_program(units, seed=5) + "\nlet mal: integer = \"x\";\n"
+    print(f"Programa: {code.count(chr(10))} líneas")
+
+    edits = [
+        ("cuerpo de una función", lambda c: c.replace("return a;", "return a + 1;", 1)),
+        ("global nueva al final", lambda c: c + "let extra: integer = 1;\n"),
+        ("tipo de un campo", lambda c: c.replace("let x: integer;", "let x: float;", 1)),
+    ]
+
+    dfacache.load()
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+    session.compile_source(generate_program(300, seed=7))  # calienta los DFA
+    incremental = IncrementalChecker(PREDICTION_TWO_STAGE)
+
+    t_inc, got = timed(incremental.check, code)
+    print(f"{'edición':26}{'completo (s)':>14}{'incremental (s)':>17}  cuerpos re-chequeados")
+    print(f"{'(primer chequeo)':26}{'-':>14}{t_inc:>17.2f}  {incremental.stats}")
+    same = True
+    for name, edit in edits:
+        code = edit(code)
+        t_full, expected = timed(session.compile_source, code)
+        t_inc, got = timed(incremental.check, code)
+        same &= got == expected
+        print(f"{name:26}{t_full:>14.2f}{t_inc:>17.2f}  {incremental.stats}"
+              f"{'' if got == expected else '  DISTINTOS'}")
+    dfacache.save()
+    print(f"Diagnósticos idénticos: {'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
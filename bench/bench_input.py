@@ -0,0 +1,61 @@
+# bench/bench_input.py
+# FileStream vs. open_stream (mmap) sobre un archivo generado grande: tiempo de apertura,
+# pico de memoria y memoria retenida por el stream (tracemalloc; las páginas del mmap son
+# caché de archivos del sistema operativo y no cuentan), y tiempo de recorrer el primer
+# millón de caracteres con LA(), como lo hace el lexer de ANTLR.
+#
+# Uso: python bench/bench_input.py [MB]     (default: 50)
+import gc, os, sys, tempfile, time, tracemalloc
+from pathlib import Path
+from antlr4 import FileStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics.mmapstream import open_stream
+from corpus import generate_program
+
+MB = 1024 * 1024
+
+def measure(open_fn, path):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    stream = open_fn(path)
+    t_open = time.perf_counter() - t0
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    t0 = time.perf_counter()
+    for _ in range(min(stream.size, 1_000_000)):
+        stream.LA(1)
+        stream.consume()
+    t_scan = time.perf_counter() - t0
+    return stream, t_open, peak, retained, t_scan
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    unit = generate_program(500, seed=3)
+    with tempfile.NamedTemporaryFile("w", suffix=".cps", delete=False, encoding="utf-8") as f:
+        for _ in range(max(1, size * MB // len(unit))):
+            f.write(unit)
+        path = f.name
+    print(f"Archivo: {os.path.getsize(path) / MB:.0f} MB")
+    print(f"{'':14}{'apertura (s)':>14}{'pico (MB)':>11}{'retenido (MB)':>15}{'LA 1M (s)':>11}")
+    try:
+        results = {}
+        for name, open_fn in [("FileStream", lambda p: FileStream(p, encoding="utf-8")),
+                              ("open_stream", open_stream)]:
+            stream, t_open, peak, retained, t_scan = measure(open_fn, path)
+            results[name] = (stream.size, stream.getText(0, 999), stream.getText(stream.size - 1000, stream.size))
+            print(f"{name:14}{t_open:>14.2f}{peak / MB:>11.1f}{retained / MB:>15.1f}{t_scan:>11.2f}")
+            del stream
+    finally:
+        os.unlink(path)
+    same = results["FileStream"] == results["open_stream"]
+    print(f"Mismo contenido: {'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
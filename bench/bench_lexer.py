@@ -0,0 +1,53 @@
+# bench/bench_lexer.py
+# CompiscriptLexer (ANTLR) vs. RegexLexer sobre un programa generado: solo lexeo
+# (getAllTokens) y compile() completo con cada lexer. Verifica que los tokens y los
+# diagnósticos sean idénticos.
+#
+# Uso: python bench/bench_lexer.py [unidades]     (default: 3000)
+import sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics import dfacache
+from semantics.lexer import LEXER_MODES, create_lexer
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from corpus import generate_program
+
+def lex(kind, code):
+    t0 = time.perf_counter()
+    tokens = create_lexer(kind, InputStream(code)).getAllTokens()
+    elapsed = time.perf_counter() - t0
+    return elapsed, [(t.type, t.start, t.stop, t.line, t.column) for t in tokens]
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    code = generate_program(units, seed=3, with_errors=True)
+    print(f"Programa: {code.count(chr(10))} líneas, {len(code) // 1024} KB")
+
+    dfacache.load()
+    sessions = {kind: CompilerSession(PREDICTION_TWO_STAGE, lexer=kind) for kind in LEXER_MODES}
+    for session in sessions.values():
+        session.compile_source(generate_program(300, seed=7))  # calienta los DFA
+
+    print(f"{'lexer':8}{'tokens':>10}{'lexeo (s)':>11}{'tokens/s':>11}{'compile (s)':>13}")
+    results = {}
+    for kind, session in sessions.items():
+        t_lex, tokens = lex(kind, code)
+        t0 = time.perf_counter()
+        errors = [str(e) for e in session.compile_source(code).errors]
+        t_compile = time.perf_counter() - t0
+        results[kind] = (tokens, errors)
+        print(f"{kind:8}{len(tokens):>10}{t_lex:>11.2f}{len(tokens) / t_lex:>11.0f}{t_compile:>13.2f}")
+    dfacache.save()
+    same = len(set(map(repr, results.values()))) == 1
+    print(f"Tokens y diagnósticos idénticos: {'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+# bench/bench_parallel.py
+# Chequeo secuencial (CompilerSession.compile) vs. check_parallel, que parsea un esqueleto
+# con las declaraciones y reparte los cuerpos de funciones y métodos en N procesos, sobre un
+# programa generado con miles de funciones. Verifica que los diagnósticos sean idénticos.
+#
+# Uso: python bench/bench_parallel.py [unidades] [procesos ...]     (default: 3000, 1 2 4)
+import os, sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics import dfacache
+from semantics.parallel import check_parallel
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from corpus import generate_program
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    workers = [int(a) for a in sys.argv[2:]] or [1, 2, 4]
+    code = generate_program(units, seed=5, with_errors=True).replace("let e", "let q")
+    print(f"Programa: {code.count(chr(10))} líneas, {code.count('function ')} funciones y métodos; "
+          f"{os.cpu_count()} núcleo(s)")
+
+    dfacache.load()
+    session = CompilerSession(PREDICTION_TWO_STAGE)
+    session.compile_source(generate_program(300, seed=7))  # calienta los DFA
+    dfacache.save()  # los workers cargan el snapshot ya caliente
+
+    t0 = time.perf_counter()
+    expected = [str(e) for e in session.compile(InputStream(code)).errors]
+    t_seq = time.perf_counter() - t0
+    print(f"{'':14}{'tiempo (s)':>12}{'speedup':>10}  diagnósticos")
+    print(f"{'secuencial':14}{t_seq:>12.2f}{1:>10.2f}  {len(expected)}")
+
+    same = True
+    for n in workers:
+        t0 = time.perf_counter()
+        got = [str(e) for e in check_parallel(code, n, PREDICTION_TWO_STAGE).errors]
+        elapsed = time.perf_counter() - t0
+        same &= got == expected
+        print(f"{f'{n} proceso(s)':14}{elapsed:>12.2f}{t_seq / elapsed:>10.2f}  "
+              f"{'idénticos' if got == expected else 'DISTINTOS'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
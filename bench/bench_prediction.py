@@ -0,0 +1,62 @@
+# bench/bench_prediction.py
+# Compara el modo LL completo con el modo de dos etapas (SLL -> LL):
+# verifica que los diagnósticos y el árbol sean idénticos y mide el tiempo de parseo.
+#
+# Uso: python bench/bench_prediction.py [n_unidades]
+import os, sys, time
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics.checker import SemanticChecker
+from semantics.parsing import parse, PREDICTION_LL, PREDICTION_TWO_STAGE
+from corpus import generate_program
+
+def run(code, prediction):
+    t0 = time.perf_counter()
+    parser, tree, syn = parse(InputStream(code), prediction)
+    elapsed = time.perf_counter() - t0
+    sem = []
+    if not syn.has_errors:
+        checker = SemanticChecker()
+        checker.visit(tree)
+        sem = checker.errors
+    return elapsed, tree.toStringTree(recog=parser), syn.errors, sem
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    corpus = [(p.name, p.read_text(encoding="utf-8")) for p in sorted((ROOT / "samples").glob("*.cps"))]
+    corpus.append(("generado_ok", generate_program(n, seed=1)))
+    corpus.append(("generado_err", generate_program(n, seed=2, with_errors=True)))
+
+    mismatches = 0
+    totals = {PREDICTION_LL: 0.0, PREDICTION_TWO_STAGE: 0.0}
+    for name, code in corpus:
+        best = {}
+        results = {}
+        # Se alternan los modos y se toma el mejor de 3 para no favorecer al segundo (DFA caliente)
+        for _ in range(3):
+            for mode in (PREDICTION_LL, PREDICTION_TWO_STAGE):
+                elapsed, *res = run(code, mode)
+                best[mode] = min(best.get(mode, elapsed), elapsed)
+                results[mode] = res
+        same = results[PREDICTION_LL] == results[PREDICTION_TWO_STAGE]
+        if not same:
+            mismatches += 1
+        for mode in totals:
+            totals[mode] += best[mode]
+        print(f"{'OK  ' if same else 'DIFF'} {name:40s} ll={best[PREDICTION_LL]*1000:9.1f}ms "
+              f"two-stage={best[PREDICTION_TWO_STAGE]*1000:9.1f}ms")
+
+    ll, two = totals[PREDICTION_LL], totals[PREDICTION_TWO_STAGE]
+    print(f"\nTotal: ll={ll:.3f}s two-stage={two:.3f}s speedup={ll / two:.2f}x")
+    print("Resultados idénticos" if not mismatches else f"{mismatches} archivos con resultados distintos")
+    if mismatches:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
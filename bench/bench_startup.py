@@ -0,0 +1,69 @@
+# bench/bench_startup.py
+# Tiempo de arranque de `python Driver.py` sobre un archivo vacío y desglose de
+# los imports más caros (python -X importtime). También mide cuánto cuesta
+# deserializar los ATN de CompiscriptLexer/CompiscriptParser.
+#
+# Uso: python bench/bench_startup.py [repeticiones]
+import os, statistics, subprocess, sys, tempfile, time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+PROGRAM = ROOT / "program"
+
+def driver_cmd(path, *flags):
+    return [sys.executable, *flags, "Driver.py", "--no-dfa-cache", path]
+
+def time_driver(path, runs):
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run(driver_cmd(path), cwd=PROGRAM, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples), min(samples)
+
+def top_imports(path, n=10):
+    proc = subprocess.run(driver_cmd(path, "-X", "importtime"), cwd=PROGRAM, check=True,
+                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    # Solo módulos de primer nivel (sin sangría), ordenados por tiempo acumulado
+    rows = [r for r in rows if not r[1].startswith("  ")]
+    return sorted(rows, reverse=True)[:n]
+
+def atn_deserialization():
+    code = ("import time, CompiscriptLexer as L, CompiscriptParser as P\n"
+            "from antlr4.atn.ATNDeserializer import ATNDeserializer\n"
+            "for m in (L, P):\n"
+            "    t = time.perf_counter(); ATNDeserializer().deserialize(m.serializedATN())\n"
+            "    print(m.__name__, round((time.perf_counter() - t) * 1000, 2))\n")
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROGRAM, check=True,
+                         capture_output=True, text=True).stdout
+    return out.split()
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    python_only = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        python_only.append(time.perf_counter() - t0)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".cps", delete=False) as f:
+        empty = f.name
+    try:
+        med, best = time_driver(empty, runs)
+        print(f"python -c pass       : mediana {statistics.median(python_only)*1000:7.1f} ms")
+        print(f"Driver.py (vacío)    : mediana {med*1000:7.1f} ms, mínimo {best*1000:7.1f} ms")
+        print("\nImports de primer nivel más caros (µs acumulados):")
+        for us, name in top_imports(empty):
+            print(f"  {us:8d}  {name.strip()}")
+        it = iter(atn_deserialization())
+        print("\nDeserialización de ATN (ms):", ", ".join(f"{m}={v}" for m, v in zip(it, it)))
+    finally:
+        os.unlink(empty)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# bench/bench_stream.py
+# Pico de memoria (tracemalloc) y tiempo de compile() completo vs. modo streaming
+# (CompilerSession(stream=True)) sobre un programa generado; verifica que los
+# diagnósticos sean idénticos.
+#
+# Uso: python bench/bench_stream.py [líneas]     (default: 20000)
+import gc, sys, time, tracemalloc
+from pathlib import Path
+from antlr4 import InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics import dfacache
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from corpus import generate_program
+
+MB = 1024 * 1024
+
+def run(session, code, trace):
+    stream = InputStream(code)
+    gc.collect()
+    if trace:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    result = session.compile(stream)
+    elapsed = time.perf_counter() - t0
+    peak = 0
+    if trace:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed, peak, (result.syntax_errors, result.semantic_errors)
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    code = generate_program(max(1, lines * 1000 // 5669), seed=3, with_errors=True)
+    print(f"Programa: {code.count(chr(10))} líneas")
+
+    dfacache.load()
+    full = CompilerSession(PREDICTION_TWO_STAGE)
+    stream = CompilerSession(PREDICTION_TWO_STAGE, stream=True)
+    full.compile_source(generate_program(300, seed=7))  # calienta los DFA
+
+    t_full, _, diag_full = run(full, code, trace=False)
+    t_stream, _, diag_stream = run(stream, code, trace=False)
+    _, peak_full, _ = run(full, code, trace=True)
+    _, peak_stream, _ = run(stream, code, trace=True)
+    dfacache.save()
+
+    print(f"{'':12}{'tiempo (s)':>12}{'pico (MB)':>12}")
+    print(f"{'completo':12}{t_full:>12.2f}{peak_full / MB:>12.1f}")
+    print(f"{'streaming':12}{t_stream:>12.2f}{peak_stream / MB:>12.1f}")
+    print(f"Diagnósticos idénticos: {'sí' if diag_full == diag_stream else 'NO'} "
+          f"({len(diag_full[0])} sintácticos, {len(diag_full[1])} semánticos)")
+    return 0 if diag_full == diag_stream else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+# bench/bench_symbols.py
+# Memoria de la tabla de símbolos con los símbolos con __slots__ (semantics.symbols) vs.
+# dataclasses con __dict__ (como eran antes), sobre un programa generado de N declaraciones
+# globales (variables, constantes, funciones con parámetros y clases con miembros).
+#
+# Se cuentan con sys.getsizeof los símbolos alcanzables desde la tabla y sus contenedores
+# (listas de parámetros, dicts de campos/métodos, __dict__); los tipos (internados) y los
+# nombres son los mismos en ambos casos y no se cuentan.
+#
+# Uso: python bench/bench_symbols.py [declaraciones]     (default: 100000)
+import random, sys, time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+
+from semantics import checker as checker_module
+from semantics.parsing import PREDICTION_TWO_STAGE
+from semantics.session import CompilerSession
+from semantics.types import Type
+
+MB = 1024 * 1024
+
+# Símbolos de referencia: mismos campos, sin slots
+@dataclass
+class DictSymbol:
+    name: str
+    type: Type
+
+@dataclass
+class DictVarSymbol(DictSymbol):
+    is_const: bool = False
+    initialized: bool = False
+
+@dataclass
+class DictParamSymbol(DictSymbol):
+    pass
+
+@dataclass
+class DictFunctionSymbol(DictSymbol):
+    params: List[DictParamSymbol] = field(default_factory=list)
+
+@dataclass
+class DictClassSymbol(DictSymbol):
+    fields: Dict[str, DictSymbol] = field(default_factory=dict)
+    methods: Dict[str, DictFunctionSymbol] = field(default_factory=dict)
+    base: Optional['DictClassSymbol'] = None
+
+BASELINE = {"VarSymbol": DictVarSymbol, "ParamSymbol": DictParamSymbol,
+            "FunctionSymbol": DictFunctionSymbol, "ClassSymbol": DictClassSymbol}
+
+def generate_declarations(n, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(n):
+        r = rng.random()
+        if r < 0.5:
+            lines.append(f"let v{i}: integer = {rng.randint(0, 99)};")
+        elif r < 0.7:
+            lines.append(f"const k{i}: string = \"k\";")
+        elif r < 0.9:
+            lines.append(f"function f{i}(a: integer, b: float): integer {{ return a; }}")
+        else:
+            lines.append(f"class C{i} {{ let x: integer; let s: string; "
+                         f"function getX(): integer {{ return this.x; }} }}")
+    return "\n".join(lines) + "\n"
+
+def symbol_bytes(table):
+    seen, total = set(), 0
+    pending = list(table)
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (list, tuple)):
+            pending.extend(obj)
+            continue
+        if isinstance(obj, dict):
+            pending.extend(obj.values())
+            continue
+        if hasattr(obj, "__dict__"):
+            total += sys.getsizeof(obj.__dict__)
+        for attr in ("params", "fields", "methods"):
+            value = getattr(obj, attr, None)
+            if value is not None:
+                pending.append(value)
+    return total, len(seen)
+
+def run(session, code, classes):
+    saved = {name: getattr(checker_module, name) for name in classes}
+    for name, cls in classes.items():
+        setattr(checker_module, name, cls)
+    try:
+        t0 = time.perf_counter()
+        result = session.compile_source(code)
+        elapsed = time.perf_counter() - t0
+    finally:
+        for name, cls in saved.items():
+            setattr(checker_module, name, cls)
+    errors = result.syntax_errors + result.semantic_errors
+    assert not errors, errors[:3]
+    return elapsed, symbol_bytes(result.checker.symbols)
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    code = generate_declarations(n)
+    session = CompilerSession(PREDICTION_TWO_STAGE, stream=True)
+    session.compile_source(generate_declarations(200, seed=1))  # calienta los DFA
+
+    t_slots, (b_slots, objs) = run(session, code, {})
+    t_dict, (b_dict, _) = run(session, code, BASELINE)
+
+    print(f"{n} declaraciones, {objs} objetos en la tabla")
+    print(f"{'':12}{'tiempo (s)':>12}{'símbolos (MB)':>15}{'bytes/objeto':>14}")
+    print(f"{'__dict__':12}{t_dict:>12.2f}{b_dict / MB:>15.1f}{b_dict / objs:>14.0f}")
+    print(f"{'__slots__':12}{t_slots:>12.2f}{b_slots / MB:>15.1f}{b_slots / objs:>14.0f}")
+    print(f"Reducción: {1 - b_slots / b_dict:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
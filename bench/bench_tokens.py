@@ -0,0 +1,61 @@
+# bench/bench_tokens.py
+# CommonTokenStream vs. ArrayTokenStream (tokens en columnas) sobre un programa generado,
+# con cada lexer: tiempo de lexear todo el archivo al stream (fill), memoria retenida por
+# los tokens (tracemalloc) y bytes por token. Verifica que los tokens sean idénticos.
+#
+# Uso: python bench/bench_tokens.py [unidades]     (default: 3000)
+import gc, sys, time, tracemalloc
+from pathlib import Path
+from antlr4 import CommonTokenStream, InputStream
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics.lexer import LEXER_MODES, create_lexer
+from semantics.tokens import ArrayTokenStream
+from corpus import generate_program
+
+STREAMS = {"common": CommonTokenStream, "compact": ArrayTokenStream}
+
+def fill(kind, stream_cls, code, traced):
+    lexer = create_lexer(kind, InputStream(code))
+    lexer.removeErrorListeners()
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    stream = stream_cls(lexer)
+    stream.fill()
+    elapsed = time.perf_counter() - t0
+    retained = tracemalloc.get_traced_memory()[0] if traced else 0
+    tracemalloc.stop()
+    return elapsed, retained, stream
+
+def tokens_of(stream):
+    tokens = stream.tokens if isinstance(stream, CommonTokenStream) else \
+        [stream.get(i) for i in range(len(stream.columns))]
+    return [(t.type, t.start, t.stop, t.line, t.column, t.tokenIndex) for t in tokens]
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    code = generate_program(units, seed=3, with_errors=True)
+    print(f"Programa: {code.count(chr(10))} líneas, {len(code) // 1024} KB")
+
+    print(f"{'lexer':8}{'stream':9}{'tokens':>10}{'fill (s)':>10}{'memoria (MB)':>14}{'bytes/token':>13}")
+    results = set()
+    for kind in LEXER_MODES:
+        for name, stream_cls in STREAMS.items():
+            elapsed, _, stream = fill(kind, stream_cls, code, traced=False)
+            _, retained, _ = fill(kind, stream_cls, code, traced=True)
+            tokens = tokens_of(stream)
+            results.add(repr(tokens))
+            print(f"{kind:8}{name:9}{len(tokens):>10}{elapsed:>10.2f}"
+                  f"{retained / 2 ** 20:>14.1f}{retained / len(tokens):>13.0f}")
+    same = len(results) == 1
+    print(f"Tokens idénticos: {'sí' if same else 'NO'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
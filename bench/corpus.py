@@ -0,0 +1,80 @@
+# bench/corpus.py
+# Generador de programas Compiscript sintéticos para los benchmarks.
+import random
+
+def _expr(rng, depth=0):
+    if depth > 2 or rng.random() < 0.3:
+        return rng.choice(["a", "b", str(rng.randint(0, 99)), "(a + 1)"])
+    op = rng.choice(["+", "-", "*", "/", "%"])
+    return f"{_expr(rng, depth + 1)} {op} {_expr(rng, depth + 1)}"
+
+def _function(rng, i):
+    body = [f"  let a: integer = {rng.randint(0, 9)};",
+            f"  let b: integer = {_expr(rng)};"]
+    for _ in range(rng.randint(1, 4)):
+        kind = rng.random()
+        if kind < 0.3:
+            body.append(f"  if (a < b) {{ a = {_expr(rng)}; }} else {{ b = {_expr(rng)}; }}")
+        elif kind < 0.5:
+            body.append(f"  while (a > 0) {{ a = a - 1; if (a == 3) {{ break; }} }}")
+        elif kind < 0.7:
+            body.append(f"  for (let k: integer = 0; k < 10; k = k + 1) {{ b = b + k; }}")
+        elif kind < 0.85:
+            body.append(f"  let xs: integer[] = [a, b, {rng.randint(0, 9)}];")
+            body.append(f"  foreach (x in xs) {{ a = a + x; }}")
+        else:
+            body.append(f"  print(\"f{i}\");")
+    body.append(f"  return {_expr(rng)};")
+    return f"function f{i}(p: integer, q: integer): integer {{\n" + "\n".join(body) + "\n}"
+
+def _class(rng, i):
+    return (f"class C{i} {{\n"
+            f"  let x: integer;\n"
+            f"  let s: string;\n"
+            f"  function setX(v: integer) {{ this.x = v; }}\n"
+            f"  function getX(): integer {{ return this.x + {rng.randint(0, 9)}; }}\n"
+            f"}}")
+
+def generate_program(n_units: int, seed: int = 0, with_errors: bool = False) -> str:
+    """Programa válido de ~n_units declaraciones (funciones, clases y globales)."""
+    rng = random.Random(seed)
+    parts = []
+    for i in range(n_units):
+        r = rng.random()
+        if r < 0.4:
+            parts.append(_function(rng, i))
+            parts.append(f"let r{i}: integer = f{i}({rng.randint(0, 9)}, {rng.randint(0, 9)});")
+        elif r < 0.6:
+            parts.append(_class(rng, i))
+            parts.append(f"let o{i}: C{i} = new C{i}();")
+            parts.append(f"o{i}.setX({rng.randint(0, 9)});")
+        elif r < 0.8:
+            parts.append(f"let g{i}: boolean = {rng.randint(0, 9)} < {rng.randint(0, 9)} && true;")
+        else:
+            parts.append(f"const K{i}: string = \"k{i}\";")
+        if with_errors and rng.random() < 0.05:
+            parts.append(rng.choice([
+                f"let e{i}: integer = \"x\";",
+                f"let e{i}: integer = ;",
+                f"u{i} = 3;",
+            ]))
+    return "\n".join(parts) + "\n"
+
+def generate_statements(n_statements: int, seed: int = 0) -> str:
+    """n_statements sentencias de nivel superior cortas (declaraciones, asignaciones,
+    print, if/while), sin funciones ni clases."""
+    rng = random.Random(seed)
+    lines = ["let a: integer = 1;", "let b: integer = 2;"]
+    for i in range(n_statements - 2):
+        r = rng.random()
+        if r < 0.35:
+            lines.append(f"let v{i}: integer = {_expr(rng)};")
+        elif r < 0.55:
+            lines.append(f"a = {_expr(rng)};")
+        elif r < 0.7:
+            lines.append(f"print(\"s{i}\" );")
+        elif r < 0.85:
+            lines.append(f"if (a < b) {{ b = {_expr(rng)}; }}")
+        else:
+            lines.append(f"while (a > {rng.randint(0, 9)}) {{ a = a - 1; }}")
+    return "\n".join(lines) + "\n"
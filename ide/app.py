@@ -1,20 +1,26 @@
 import os, sys, io, tempfile
 import streamlit as st
 from streamlit_ace import st_ace
-from antlr4 import InputStream, CommonTokenStream
+from antlr4 import InputStream
 from antlr4.error.ErrorListener import ErrorListener
 
 ROOT = os.path.dirname(os.path.dirname(__file__))
 sys.path.append(os.path.join(ROOT, "program"))
 sys.path.append(os.path.join(ROOT, "src"))
 
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-from semantics.errors import SyntaxErrorListener
-from semantics.checker import SemanticChecker
+from semantics import dfacache
+from semantics.parsing import PREDICTION_MODES
+from semantics.session import CompilerSession
 from semantics.treeviz import render_parse_tree_svg
 
 # ---------- Utils ----------
+@st.cache_resource
+def get_session(prediction: str) -> CompilerSession:
+    # Una sesión por modo, compartida entre reruns: lexer/parser y DFA ya calientes.
+    # Con tablas laterales para mostrar el tipo de cada nodo en el árbol
+    dfacache.load()
+    return CompilerSession(prediction, side_tables=True)
+
 def read_bytes_as_text(b: bytes) -> str:
     for enc in ("utf-8", "latin-1", "cp1252"):
         try:
@@ -54,6 +60,9 @@ with st.sidebar:
         if st.button("⬅️ Cargar al editor"):
             st.session_state.code = read_bytes_as_text(uploads[idx].read())
 
+    st.header("⚙️ Opciones")
+    prediction = st.selectbox("Modo de predicción", PREDICTION_MODES)
+
 code = st_ace(
     language="text",
     theme="dracula",
@@ -69,32 +78,23 @@ run = col1.button("Analizar")
 if run:
     st.session_state.code = code or ""  
     input_stream = InputStream(st.session_state.code)
-    lexer = CompiscriptLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = CompiscriptParser(tokens)
-
-    syn = SyntaxErrorListener()
-    parser.removeErrorListeners()
-    parser.addErrorListener(syn)
-
-    tree = parser.program()
+    result = get_session(prediction).compile(input_stream)
+    dfacache.save()
 
-    if syn.has_errors:
+    if result.syntax_errors:
         st.error("Errores sintácticos:")
-        for e in syn.errors:
-            st.write(e)
+        for e in result.syntax_errors:
+            st.write(str(e))
     else:
-        checker = SemanticChecker()
-        checker.visit(tree)
-        if checker.errors:
+        if result.semantic_errors:
             st.error("Errores semánticos:")
-            for e in checker.errors:
-                st.write(e)
+            for e in result.semantic_errors:
+                st.write(str(e))
         else:
             st.success("ANÁLISIS SEMÁNTICO NÍTIDO ✅")
 
         try:
-            svg = render_parse_tree_svg(tree, parser.ruleNames)
+            svg = render_parse_tree_svg(result.tree, result.parser.ruleNames, result.checker)
             st.subheader("Árbol (Parse Tree)")
             st.image(svg)
         except Exception:
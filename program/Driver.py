@@ -1,61 +1,175 @@
-import sys, os
-from antlr4 import FileStream, CommonTokenStream
+import sys, os, argparse, shutil, time
 from antlr4.error.ErrorListener import ErrorListener
 
-# Generated names: CompiscriptLexer.py, CompiscriptParser.py
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-
 # Make src importable
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from src.semantics.errors import SyntaxErrorListener, SemanticError
-from src.semantics.checker import SemanticChecker
-from src.semantics.treeviz import render_parse_tree_svg
+from src.semantics import dfacache
+from src.semantics.batch import check_files, expand_inputs
+from src.semantics.lexer import LEXER_ANTLR, LEXER_MODES
+from src.semantics.parsing import PREDICTION_LL, PREDICTION_MODES
+from src.semantics.resultcache import DEFAULT_MAX_BYTES
+from src.semantics.session import CompilerSession
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python Driver.py <file.cps>")
-        sys.exit(1)
+DEFAULT_MAX_ERRORS = 100
+WATCH_INTERVAL = 0.5  # segundos entre chequeos del mtime
 
-    filename = sys.argv[1]
-    input_stream = FileStream(filename, encoding='utf-8')
+def result_cache(args):
+    if args.no_cache:
+        return None
+    from src.semantics.resultcache import ResultCache
+    return ResultCache(max_bytes=args.cache_size * 1024 * 1024)
 
-    # Lexing & Parsing
-    lexer = CompiscriptLexer(input_stream)
-    token_stream = CommonTokenStream(lexer)
-    parser = CompiscriptParser(token_stream)
+def print_errors(result, args, indent=""):
+    # result es un CompileResult o un FileResult; la nota solo si el análisis se cortó
+    for e in result.errors:
+        print(f"{indent}{e}")
+    if result.truncated:
+        print(f"{indent}(análisis detenido tras {args.max_errors} errores; ver --max-errors)")
 
-    syntax_listener = SyntaxErrorListener()
-    parser.removeErrorListeners()
-    parser.addErrorListener(syntax_listener)
+def check_single_parallel(filename, args):
+    # Un archivo con -j N: cuerpos de funciones y métodos repartidos en N procesos (sin SVG)
+    from src.semantics.parallel import check_parallel
+    with open(filename, encoding="utf-8") as f:
+        code = f.read()
+    if not args.no_dfa_cache:
+        dfacache.load()
+    result = check_parallel(code, args.jobs, args.prediction, args.max_errors)
+    if not args.no_dfa_cache:
+        dfacache.save()
+    print_errors(result, args)
+    if not result.ok:
+        return 1
+    print("Semantic OK")
+    return 0
+
+def watch(filename, args):
+    # Re-chequea al cambiar el archivo; solo vuelve a chequear los cuerpos de funciones
+    # y métodos afectados por el cambio
+    from src.semantics.incremental import IncrementalChecker
+    checker = IncrementalChecker(args.prediction, args.max_errors)
+    last = None
+    try:
+        while True:
+            try:
+                mtime = os.stat(filename).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and mtime != last:
+                last = mtime
+                with open(filename, encoding="utf-8") as f:
+                    code = f.read()
+                t0 = time.perf_counter()
+                result = checker.check(code)
+                print(f"--- {filename}: {checker.stats} ({time.perf_counter() - t0:.2f} s)")
+                print_errors(result, args)
+                if result.ok:
+                    print("Semantic OK")
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        return 0
 
-    tree = parser.program()
+def check_single(filename, args):
+    if args.jobs and args.jobs > 1 and not (args.stream or args.syntax_only):
+        return check_single_parallel(filename, args)
+    # Sin 'dot' (o con --stream / --syntax-only) no hay SVG, así que no hace falta el árbol
+    # y se puede usar la caché de resultados; con 'dot' se compila siempre para dibujarlo
+    if args.stream or args.syntax_only or shutil.which("dot") is None:
+        res = next(check_files([filename], 1, args.prediction, not args.no_dfa_cache,
+                               result_cache(args), args.stream, args.syntax_only, args.max_errors,
+                               args.lexer, args.compact_tokens))
+        print_errors(res, args)
+        if not res.ok:
+            return 1
+        print("Syntax OK" if args.syntax_only else "Semantic OK")
+        return 0
 
-    if syntax_listener.has_errors:
-        for e in syntax_listener.errors:
-            print(e)
-        sys.exit(1)
+    session = CompilerSession(args.prediction, max_errors=args.max_errors, lexer=args.lexer,
+                              compact_tokens=args.compact_tokens)
+    if not args.no_dfa_cache:
+        dfacache.load()
 
-    # Semantic checking
-    checker = SemanticChecker()
-    checker.visit(tree)
+    # Lexing, parsing & semantic checking
+    result = session.compile_file(filename)
+    if not args.no_dfa_cache:
+        dfacache.save()
 
-    if checker.errors:
-        for err in checker.errors:
-            print(err)
-        sys.exit(1)
+    if not result.ok:
+        print_errors(result, args)
+        return 1
 
-    # Optional: write parse tree SVG next to source
+    # Optional: write parse tree SVG next to source. graphviz is only imported
+    # here, once we know the 'dot' executable exists (the import alone costs ~40 ms)
     try:
-        svg = render_parse_tree_svg(tree, parser.ruleNames)
+        from src.semantics.treeviz import render_parse_tree_svg
+        svg = render_parse_tree_svg(result.tree, result.parser.ruleNames)
         out_svg = os.path.splitext(filename)[0] + "_parsetree.svg"
         with open(out_svg, "w", encoding="utf-8") as f:
             f.write(svg)
     except Exception as ex:
-        # Graphviz not installed or other non-critical issues
+        # Graphviz Python package missing or other non-critical issues
         pass
 
     print("Semantic OK")
+    return 0
+
+def check_batch(paths, args):
+    failed = cached = 0
+    for res in check_files(paths, args.jobs, args.prediction, not args.no_dfa_cache,
+                           result_cache(args), args.stream, args.syntax_only, args.max_errors,
+                           args.lexer, args.compact_tokens):
+        cached += res.cached
+        if res.ok:
+            print(f"{res.path}: OK")
+            continue
+        failed += 1
+        print(f"{res.path}: {len(res.errors)} error(s)")
+        print_errors(res, args, indent="  ")
+    print(f"\nChecked {len(paths)} file(s): {len(paths) - failed} OK, {failed} with errors"
+          f" ({cached} from cache)")
+    return 1 if failed else 0
+
+def main():
+    argp = argparse.ArgumentParser(description="Compiscript: análisis sintáctico y semántico")
+    argp.add_argument("files", nargs="+", metavar="file",
+                      help="archivos .cps, directorios (recursivo) o globs")
+    argp.add_argument("--prediction", choices=PREDICTION_MODES, default=PREDICTION_LL,
+                      help="modo de predicción del parser (default: ll)")
+    argp.add_argument("--lexer", choices=LEXER_MODES, default=LEXER_ANTLR,
+                      help="lexer: el generado por ANTLR o el basado en regex, más rápido (default: antlr)")
+    argp.add_argument("--compact-tokens", action="store_true",
+                      help="guardar los tokens en columnas compactas en vez de un objeto por token")
+    argp.add_argument("--no-dfa-cache", action="store_true",
+                      help="no cargar ni guardar el snapshot de DFA en disco")
+    argp.add_argument("-j", "--jobs", type=int, default=None,
+                      help="procesos para varios archivos (default: núcleos disponibles); con un solo "
+                           "archivo, reparte los cuerpos de sus funciones")
+    argp.add_argument("--stream", action="store_true",
+                      help="parsear y chequear sentencia por sentencia (memoria acotada, sin SVG)")
+    argp.add_argument("--syntax-only", action="store_true",
+                      help="solo análisis sintáctico, sin construir el árbol ni chequeo semántico")
+    argp.add_argument("--max-errors", type=int, default=DEFAULT_MAX_ERRORS, metavar="N",
+                      help="reportar a lo sumo N errores por archivo y detener ahí el análisis; 0 = sin "
+                           "límite, como antes de esta opción (default: %(default)s)")
+    argp.add_argument("--watch", action="store_true",
+                      help="con un solo archivo: re-chequear (incrementalmente) cada vez que cambia")
+    argp.add_argument("--no-cache", action="store_true",
+                      help="no usar la caché de resultados por contenido")
+    argp.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024), metavar="MB",
+                      help="tamaño máximo de la caché de resultados (default: %(default)s MB)")
+    args = argp.parse_args()
+
+    paths = expand_inputs(args.files)
+    if not paths:
+        print("No .cps files found")
+        sys.exit(2)
+
+    # Un solo archivo explícito: salida de siempre (errores o 'Semantic OK' + SVG)
+    if len(args.files) == 1 and paths == args.files:
+        sys.exit(watch(paths[0], args) if args.watch else check_single(paths[0], args))
+    if args.watch:
+        argp.error("--watch requiere un solo archivo")
+    sys.exit(check_batch(paths, args))
 
 if __name__ == "__main__":
     main()
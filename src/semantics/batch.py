@@ -0,0 +1,125 @@
+import glob, os
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional
+
+from . import dfacache
+from .lexer import LEXER_ANTLR
+from .mmapstream import open_stream
+from .parsing import PREDICTION_LL
+from .resultcache import ResultCache
+from .session import CompilerSession
+
+SOURCE_EXTENSION = ".cps"
+
+
+@dataclass
+class FileResult:
+    """Resultado de un archivo; los diagnósticos ya formateados, como se guardan en la caché."""
+    path: str
+    syntax_errors: List[str] = field(default_factory=list)
+    semantic_errors: List[str] = field(default_factory=list)
+    io_error: Optional[str] = None
+    cached: bool = False
+    truncated: bool = False  # se cortó en max_errors y había más errores
+
+    @property
+    def ok(self) -> bool:
+        return self.io_error is None and not self.syntax_errors and not self.semantic_errors
+
+    @property
+    def errors(self) -> List[str]:
+        if self.io_error is not None:
+            return [self.io_error]
+        return self.syntax_errors or self.semantic_errors
+
+
+def expand_inputs(inputs: Iterable[str]) -> List[str]:
+    """Archivos, directorios (recursivo, *.cps) y globs -> lista ordenada sin duplicados."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            found = glob.glob(os.path.join(item, "**", "*" + SOURCE_EXTENSION), recursive=True)
+        elif glob.has_magic(item):
+            found = [p for p in glob.glob(item, recursive=True) if os.path.isfile(p)]
+        else:
+            found = [item]  # si no existe se reporta como error de ese archivo
+        paths.extend(sorted(found))
+    seen = set()
+    return [p for p in paths if not (p in seen or seen.add(p))]
+
+
+def check_file(session: CompilerSession, path: str, cache: Optional[ResultCache] = None) -> FileResult:
+    try:
+        stream = open_stream(path)
+    except (OSError, UnicodeDecodeError) as ex:
+        return FileResult(path, io_error=f"[IOError] {ex}")
+
+    # Se cierra al terminar: el resultado guarda los diagnósticos como texto, y el mmap
+    # abierto retendría un descriptor por archivo (y lo bloquearía en Windows)
+    with stream:
+        key = None
+        if cache is not None:
+            key = cache.key(stream.buffer, session.cache_options)
+            hit = cache.get(key)
+            if hit is not None:
+                return FileResult(path, hit[0], hit[1], cached=True, truncated=hit[2])
+
+        result = session.compile(stream)
+        syntax_errors = [str(d) for d in result.syntax_errors]
+        semantic_errors = [str(d) for d in result.semantic_errors]
+    if key is not None:
+        cache.put(key, syntax_errors, semantic_errors, result.truncated)
+    return FileResult(path, syntax_errors, semantic_errors, truncated=result.truncated)
+
+
+# ---------- Workers del pool ----------
+_worker_session: Optional[CompilerSession] = None
+_worker_cache: Optional[ResultCache] = None
+
+
+def _init_worker(prediction: str, stream: bool, syntax_only: bool, max_errors: Optional[int],
+                 dfa_cache: bool, result_cache: Optional[ResultCache], lexer: str, compact_tokens: bool):
+    global _worker_session, _worker_cache
+    _worker_session = CompilerSession(prediction, stream, syntax_only, max_errors, lexer=lexer,
+                                      compact_tokens=compact_tokens)
+    _worker_cache = result_cache
+    if dfa_cache:
+        from multiprocessing import util as mp_util
+        dfacache.load()
+        # Los workers terminan vía multiprocessing (os._exit), que no corre atexit
+        mp_util.Finalize(None, dfacache.save, exitpriority=0)
+
+
+def _check_in_worker(path: str) -> FileResult:
+    return check_file(_worker_session, path, _worker_cache)
+
+
+def check_files(paths: List[str], jobs: Optional[int] = None, prediction: str = PREDICTION_LL,
+                dfa_cache: bool = True, result_cache: Optional[ResultCache] = None,
+                stream: bool = False, syntax_only: bool = False,
+                max_errors: Optional[int] = None, lexer: str = LEXER_ANTLR,
+                compact_tokens: bool = False) -> Iterator[FileResult]:
+    """Chequea los archivos en un pool de `jobs` procesos (default: núcleos disponibles).
+    Los resultados salen en el mismo orden que `paths`."""
+    jobs = jobs or os.cpu_count() or 1
+    jobs = min(jobs, len(paths))
+    if jobs <= 1:
+        session = CompilerSession(prediction, stream, syntax_only, max_errors, lexer=lexer,
+                                  compact_tokens=compact_tokens)
+        if dfa_cache:
+            dfacache.load()
+        for path in paths:
+            yield check_file(session, path, result_cache)
+        if dfa_cache:
+            dfacache.save()
+    else:
+        # Importado acá: un chequeo de un solo archivo no paga el costo de cargar el pool
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(paths) // (jobs * 8))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(prediction, stream, syntax_only, max_errors,
+                                           dfa_cache, result_cache, lexer, compact_tokens)) as pool:
+            yield from pool.map(_check_in_worker, paths, chunksize=chunksize)
+
+    if result_cache is not None:
+        result_cache.prune()
@@ -0,0 +1,48 @@
+import hashlib, os, sys
+
+import CompiscriptLexer as _lexer_module
+import CompiscriptParser as _parser_module
+
+_grammar_hash = None
+
+
+def cache_dir() -> str:
+    """Directorio de cachés en disco: $COMPISCRIPT_CACHE_DIR o ~/.cache/compiscript."""
+    path = os.environ.get("COMPISCRIPT_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+        "compiscript")
+    return path
+
+
+def grammar_hash() -> str:
+    """Hash de los ATN serializados del lexer y del parser (cambia al regenerar Compiscript.g4)."""
+    global _grammar_hash
+    if _grammar_hash is None:
+        h = hashlib.sha256()
+        for module in (_lexer_module, _parser_module):
+            h.update(repr(module.serializedATN()).encode("ascii"))
+        _grammar_hash = h.hexdigest()
+    return _grammar_hash
+
+
+def runtime_tag() -> str:
+    """Versión de Python, para formatos binarios dependientes del intérprete."""
+    return f"py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+_checker_version = None
+
+
+def checker_version() -> str:
+    """Hash del código de src/semantics: cualquier cambio en el checker invalida resultados."""
+    global _checker_version
+    if _checker_version is None:
+        h = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(here)):
+            if name.endswith(".py"):
+                with open(os.path.join(here, name), "rb") as f:
+                    h.update(name.encode("utf-8"))
+                    h.update(f.read())
+        _checker_version = h.hexdigest()
+    return _checker_version
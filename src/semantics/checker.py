@@ -1,21 +1,79 @@
 from typing import List, Optional
-from antlr4 import ParseTreeVisitor, TerminalNode
+from antlr4 import TerminalNode
 from antlr4 import ParserRuleContext
-from .scope import Scope
+from .errors import Diagnostic, TooManyErrors
+from .scope import RecordingClassTable, RecordingSymbolTable, SymbolTable
 from .symbols import VarSymbol, ParamSymbol, FunctionSymbol, ClassSymbol
 from .types import *
-
-
-
-class SemanticChecker(ParseTreeVisitor):
-    def __init__(self):
-        self.global_scope = Scope()
-        self.scope = self.global_scope
-        self.errors: List[str] = []
+from .walker import StackVisitor
+from CompiscriptLexer import CompiscriptLexer
+
+# Tipos de token del lexer generado
+_TOKEN = {lit: ttype for ttype, lit in enumerate(CompiscriptLexer.literalNames)}
+_IDENTIFIER = CompiscriptLexer.Identifier
+_LITERAL = CompiscriptLexer.Literal
+_THIS = _TOKEN["'this'"]
+_NEW = _TOKEN["'new'"]
+_ASSIGN = _TOKEN["'='"]
+_QUESTION = _TOKEN["'?'"]
+_LPAREN, _LBRACKET, _DOT = _TOKEN["'('"], _TOKEN["'['"], _TOKEN["'.'"]
+_KEYWORD_TYPES = {_TOKEN["'true'"]: BOOL, _TOKEN["'false'"]: BOOL, _TOKEN["'null'"]: NULL}
+
+# Palabras clave y puntuación: visitTerminal nunca les da tipo. Quedan fuera los
+# literales implícitos que sí lo tienen ('this', 'null', 'true', 'false').
+_SKIP_TOKEN_TYPES = frozenset(
+    ttype for ttype, lit in enumerate(CompiscriptLexer.literalNames)
+    if lit.startswith("'") and ttype != _THIS and ttype not in _KEYWORD_TYPES)
+
+
+
+def _literal_type(text):
+    """Tipo de un token Literal (StringLiteral | FloatLiteral | IntegerLiteral)."""
+    if text[0] == '"':
+        return STR
+    return FLOAT if "." in text else INT
+
+
+# Los visitX que visitan hijos son generadores: `t = yield hijo` devuelve el tipo del
+# hijo (ver walker.StackVisitor), así la profundidad del árbol no consume la pila de Python.
+class SemanticChecker(StackVisitor):
+    SKIP_TOKEN_TYPES = _SKIP_TOKEN_TYPES
+
+    def __init__(self, max_errors: Optional[int] = None, track_dependencies: bool = False,
+                 side_tables: bool = False):
+        self.errors: List[Diagnostic] = []
+        self.max_errors = max_errors
+        self.truncated = False  # True si se cortó por max_errors
         self.loop_depth = 0
         self.current_function: Optional[FunctionSymbol] = None
-        self.class_table = {}
+        if track_dependencies:
+            self.symbols = RecordingSymbolTable()
+            self.class_table = RecordingClassTable(self.symbols.used)
+        else:
+            self.symbols = SymbolTable()
+            self.class_table = {}
         self.current_class = None
+        # Tablas laterales id(nodo) -> Type / Symbol; válidas mientras el árbol siga vivo
+        if side_tables:
+            self.node_results = {}
+            self.node_symbols = {}
+        else:
+            self.node_symbols = None
+
+    def type_of(self, node) -> Optional[Type]:
+        """Tipo calculado para el nodo (requiere side_tables=True)."""
+        self._require_side_tables("type_of")
+        return self.node_results.get(id(node))
+
+    def symbol_of(self, node):
+        """Símbolo al que resolvió el identificador (terminal) del nodo (requiere side_tables=True)."""
+        self._require_side_tables("symbol_of")
+        return self.node_symbols.get(id(node))
+
+    def _require_side_tables(self, method: str):
+        if self.node_symbols is None:
+            raise RuntimeError(f"{method}() requiere SemanticChecker(side_tables=True) "
+                               "(o CompilerSession(side_tables=True))")
 
     # Devuelve el hijo expression(idx)
     def _expr_child(self, ctx, idx=0):
@@ -34,51 +92,61 @@ class SemanticChecker(ParseTreeVisitor):
         ex = ctx.expression()
         return ex if isinstance(ex, list) else [ex] 
      
-    # Visita hijos de un nodo y devuelve el último tipo no-NULL encontrado.
-    def visitChildren(self, node):
-        res = None
-        n = node.getChildCount()
-        for i in range(n):
-            child = node.getChild(i)
-            r = child.accept(self) if hasattr(child, "accept") else None
-            if r is not None:
-                res = r
-        return res
-    
-    # Clasifica tokens terminales: números, strings, booleanos, null, id.
-    def visitTerminal(self, node: TerminalNode):
-        t = node.getText()
+    # visitChildren (walker.StackVisitor) devuelve el último tipo no-NULL encontrado
+    def aggregateResult(self, aggregate, nextResult):
+        return nextResult if nextResult is not None else aggregate
 
-        # string
-        if len(t) >= 2 and t[0] == '"' and t[-1] == '"':
-            return STR
+    # Clasifica tokens terminales por tipo de token: literales, true/false/null, this e
+    # identificadores. Solo los identificadores llegan a resolverse en el ámbito.
+    def visitTerminal(self, node: TerminalNode):
+        tok = node.symbol
+        ttype = tok.type
+
+        if ttype == _IDENTIFIER:
+            sym = self.symbols.resolve(tok.text)
+            if sym is not None and self.node_symbols is not None:
+                self.node_symbols[id(node)] = sym
+            if sym is not None and hasattr(sym, "type"):
+                return sym.type
+            return None
 
-        # Boolean
-        if t == "true" or t == "false":
-            return BOOL
-        if t == "null":
-            return NULL
+        if ttype == _LITERAL:
+            return _literal_type(tok.text)
 
-        # integer
-        if t.isdigit():
-            return INT
+        if ttype == _THIS:
+            # 'this' se define como variable en el ámbito de cada método
+            return self.current_class.type if self.current_class is not None else None
 
-        sym = self.scope.resolve(t)
-        if sym is not None and hasattr(sym, "type"):
-            return sym.type
+        return _KEYWORD_TYPES.get(ttype)
 
-        return None
 
+    @property
+    def dependencies(self):
+        """Con track_dependencies: nombres buscados en el ámbito o en la tabla de clases."""
+        return getattr(self.symbols, "used", None)
 
-    def err(self, ctx: ParserRuleContext, message: str):
+    # code es una clave de errors.MESSAGES; el texto se arma al imprimir el Diagnostic
+    def err(self, ctx: ParserRuleContext, code: str, *args):
+        if len(self.errors) == self.max_errors:
+            self.truncated = True
+            raise TooManyErrors()
         tok = ctx.start
-        line, col = tok.line, tok.column
-        self.errors.append(f"[SemanticError] L{line}:C{col} {message}")
+        self.errors.append(Diagnostic("SemanticError", code, tok.line, tok.column, args))
+
+    def _note_symbol(self, node, sym):
+        if self.node_symbols is not None and node is not None:
+            self.node_symbols[id(node)] = sym
+
+    def _define(self, ctx, sym):
+        try:
+            self.symbols.define(sym)
+        except ValueError:
+            self.err(ctx, "redeclared", sym.name)
 
 
     def visitProgram(self, ctx):
         for st in ctx.statement():
-            self.visit(st)
+            (yield st)
         return None
 
     def visitVariableDeclaration(self, ctx):
@@ -89,20 +157,17 @@ class SemanticChecker(ParseTreeVisitor):
         if declared_type:
             vtype = declared_type
         elif init_expr:
-            vtype = self._infer_type(init_expr)
+            vtype = yield from self._infer_type(init_expr)
         else:
-            self.err(ctx, f"No se puede inferir el tipo de '{name}' sin anotación ni inicializador.")
+            self.err(ctx, "cannot-infer", name)
             vtype = NULL
 
-        try:
-            self.scope.define(VarSymbol(name=name, type=vtype, is_const=False, initialized=bool(init_expr)))
-        except ValueError as ex:
-            self.err(ctx, str(ex))
+        self._define(ctx, VarSymbol(name=name, type=vtype, is_const=False, initialized=bool(init_expr)))
 
         if init_expr:
-            et = self.visit(init_expr) or NULL
+            et = (yield init_expr) or NULL
             if not vtype.is_compatible(et):
-                self.err(ctx, f"Asignación incompatible: variable '{name}' es {vtype} pero expresión es {et}.")
+                self.err(ctx, "variable-mismatch", name, vtype, et)
         return None
 
     # Const declaracion
@@ -110,16 +175,13 @@ class SemanticChecker(ParseTreeVisitor):
         name = ctx.Identifier().getText()
         declared_type = self._type_from_annotation(ctx.typeAnnotation())
         expr = self._expr_child(ctx, 0)
-        et = self.visit(expr) if expr is not None else NULL
+        et = (yield expr) if expr is not None else NULL
 
         vtype = declared_type if declared_type else et
         if declared_type and not declared_type.is_compatible(et):
-            self.err(ctx, f"Constante '{name}' declarada como {declared_type} pero inicializa con {et}.")
+            self.err(ctx, "constant-mismatch", name, declared_type, et)
 
-        try:
-            self.scope.define(VarSymbol(name=name, type=vtype, is_const=True, initialized=True))
-        except ValueError as ex:
-            self.err(ctx, str(ex))
+        self._define(ctx, VarSymbol(name=name, type=vtype, is_const=True, initialized=True))
         return None
 
     def visitAssignment(self, ctx):
@@ -128,7 +190,8 @@ class SemanticChecker(ParseTreeVisitor):
         #   2) expression '.' Identifier '=' expression ';'
 
         # ----- Caso 1: asignación simple (x = expr;) -----
-        if ctx.getChildCount() >= 2 and getattr(ctx.getChild(1), "getText", lambda: "")() == "=":
+        second = ctx.getChild(1)
+        if isinstance(second, TerminalNode) and second.symbol.type == _ASSIGN:
             # Identifier puede ser TerminalNode o lista (según el target)
             ident = ctx.Identifier()
             if isinstance(ident, list):
@@ -136,18 +199,19 @@ class SemanticChecker(ParseTreeVisitor):
             else:
                 name = ident.getText() if ident else "<unknown>"
 
-            sym = self.scope.resolve(name)
+            sym = self.symbols.resolve(name)
             if sym is None:
-                self.err(ctx, f"Variable no declarada: {name}")
+                self.err(ctx, "undeclared-variable", name)
                 return None
+            self._note_symbol(ident[0] if isinstance(ident, list) else ident, sym)
             if isinstance(sym, VarSymbol) and sym.is_const:
-                self.err(ctx, f"No se puede asignar a constante '{name}'.")
+                self.err(ctx, "constant-assignment", name)
 
             rhs_node = self._expr_child(ctx, 0)  # <-- usa helper (¡no ctx.expression()!)
-            et = self.visit(rhs_node) if rhs_node is not None else NULL
+            et = (yield rhs_node) if rhs_node is not None else NULL
 
             if not sym.type.is_compatible(et):
-                self.err(ctx, f"Asignación incompatible: variable '{name}' es {sym.type} pero expresión es {et}.")
+                self.err(ctx, "variable-mismatch", name, sym.type, et)
             if isinstance(sym, VarSymbol):
                 sym.initialized = True
             return None
@@ -163,60 +227,61 @@ class SemanticChecker(ParseTreeVisitor):
         else:
             prop_name = ident.getText() if ident else None
 
-        obj_t = self.visit(obj_node) if obj_node else NULL
-        rhs_t = self.visit(rhs_node) if rhs_node else NULL
+        obj_t = (yield obj_node) if obj_node else NULL
+        rhs_t = (yield rhs_node) if rhs_node else NULL
 
         if not isinstance(obj_t, ClassType):
-            self.err(ctx, "La asignación de propiedad requiere un objeto.")
+            self.err(ctx, "property-on-non-object")
             return None
 
         cls = self.class_table.get(obj_t.name)
         if not cls:
-            self.err(ctx, f"Clase '{obj_t.name}' no declarada.")
+            self.err(ctx, "undeclared-class", obj_t.name)
             return None
 
         field = cls.fields.get(prop_name)
         if field is None:
-            self.err(ctx, f"La clase '{obj_t.name}' no tiene campo '{prop_name}'.")
+            self.err(ctx, "no-such-field", obj_t.name, prop_name)
             return None
+        self._note_symbol(ident[-1] if isinstance(ident, list) else ident, field)
 
         if getattr(field, "is_const", False):
-            self.err(ctx, f"No se puede asignar al campo constante '{prop_name}'.")
+            self.err(ctx, "constant-field-assignment", prop_name)
 
         if not field.type.is_compatible(rhs_t):
-            self.err(ctx, f"Asignación incompatible: campo '{prop_name}' es {field.type} pero expresión es {rhs_t}.")
+            self.err(ctx, "field-mismatch", prop_name, field.type, rhs_t)
         return None
     
     
     def visitExpressionStatement(self, ctx):
-        self.visit(ctx.expression())
+        (yield ctx.expression())
 
     def visitPrintStatement(self, ctx):
-        self.visit(ctx.expression())
+        (yield ctx.expression())
 
     def visitIfStatement(self, ctx):
-        cond_t = self.visit(ctx.expression())
+        cond_t = (yield ctx.expression())
         if not isinstance(cond_t, BooleanType):
-            self.err(ctx, "La condición de 'if' debe ser boolean.")
-        self.visit(ctx.block(0))
+            self.err(ctx, "condition-not-boolean", "if")
+        (yield ctx.block(0))
         if ctx.block(1):
-            self.visit(ctx.block(1))
+            (yield ctx.block(1))
 
     def visitWhileStatement(self, ctx):
-        cond_t = self.visit(ctx.expression())
+        cond_t = (yield ctx.expression())
         if not isinstance(cond_t, BooleanType):
-            self.err(ctx, "La condición de 'while' debe ser boolean.")
+            self.err(ctx, "condition-not-boolean", "while")
         self.loop_depth += 1
-        self.visit(ctx.block())
+        (yield ctx.block())
         self.loop_depth -= 1
 
     def visitDoWhileStatement(self, ctx):
         self.loop_depth += 1
-        self.visit(ctx.block())
+        (yield ctx.block())
         self.loop_depth -= 1
-        cond_t = self.visit(ctx.expression())
+        cond_t = (yield ctx.expression())
         if not isinstance(cond_t, BooleanType):
-            self.err(ctx, "La condición de 'do-while' debe ser boolean.")
+            self.err(ctx, "condition-not-boolean", "do-while")
 
     def visitForStatement(self, ctx):
         # for
@@ -225,72 +290,67 @@ class SemanticChecker(ParseTreeVisitor):
         # inicializador: puede ser declaración, asignación o ';'
         first = ctx.getChild(2) if ctx.getChildCount() > 2 else None
         if hasattr(first, "accept"):
-            self.visit(first)
+            (yield first)
 
         exprs = ctx.expression()
         if exprs:
-            cond_t = self.visit(exprs[0])
+            cond_t = (yield exprs[0])
             if not isinstance(cond_t, BooleanType):
-                self.err(ctx, "La condición de 'for' debe ser boolean.")
+                self.err(ctx, "condition-not-boolean", "for")
             if len(exprs) > 1:
-                self.visit(exprs[1])
+                (yield exprs[1])
 
-        self.visit(ctx.block())
+        (yield ctx.block())
         self.loop_depth -= 1
     def visitForeachStatement(self, ctx):
         # foreach
-        arr_t = self.visit(ctx.expression())
+        arr_t = (yield ctx.expression())
         if not isinstance(arr_t, ArrayType):
-            self.err(ctx, "El 'foreach' requiere iterar sobre un arreglo.")
+            self.err(ctx, "foreach-not-array")
             elem_t = NULL
         else:
             elem_t = arr_t.elem
 
-        old = self.scope
-        self.scope = Scope(parent=old)
-        try:
-            self.scope.define(VarSymbol(name=ctx.Identifier().getText(), type=elem_t, initialized=True))
-        except ValueError as ex:
-            self.err(ctx, str(ex))
+        self.symbols.push()
+        self._define(ctx, VarSymbol(name=ctx.Identifier().getText(), type=elem_t, initialized=True))
 
         self.loop_depth += 1
-        self.visit(ctx.block())
+        (yield ctx.block())
         self.loop_depth -= 1
-        self.scope = old
+        self.symbols.pop()
 
 
     def visitBreakStatement(self, ctx):
         if self.loop_depth <= 0:
-            self.err(ctx, "'break' solo se permite dentro de bucles.")
+            self.err(ctx, "outside-loop", "break")
 
     def visitContinueStatement(self, ctx):
         if self.loop_depth <= 0:
-            self.err(ctx, "'continue' solo se permite dentro de bucles.")
+            self.err(ctx, "outside-loop", "continue")
 
     def visitReturnStatement(self, ctx):
         if self.current_function is None:
-            self.err(ctx, "'return' solo se permite dentro de una función.")
+            self.err(ctx, "return-outside-function")
             return None
         expr = ctx.expression()
         if expr:
-            et = self.visit(expr)
+            et = (yield expr)
         else:
             et = NULL
         if not self.current_function.type.is_compatible(et):
-            self.err(ctx, f"El 'return' devuelve {et} pero la función retorna {self.current_function.type}.")
+            self.err(ctx, "return-mismatch", et, self.current_function.type)
 
     # Blocks y scope
     def visitBlock(self, ctx):
-        old = self.scope
-        self.scope = Scope(parent=old)
+        self.symbols.push()
         saw_terminal = False
         for st in ctx.statement():
             if saw_terminal:
-                self.err(st, "Código inalcanzable después de una instrucción de terminación.")
-            self.visit(st)
+                self.err(st, "unreachable")
+            (yield st)
             if self._is_terminal_stmt(st):
                 saw_terminal = True
-        self.scope = old
+        self.symbols.pop()
         return None
 
 
@@ -312,37 +372,32 @@ class SemanticChecker(ParseTreeVisitor):
                 params.append(ParamSymbol(name=p_name, type=p_type))
 
         func_sym = FunctionSymbol(name=name, type=ret, params=params)
-        try:
-            self.scope.define(func_sym)
-        except ValueError as ex:
-            self.err(ctx, str(ex))
+        self._define(ctx, func_sym)
 
         # Nuevo scope para el cuerpo
-        old_scope = self.scope
-        self.scope = Scope(parent=old_scope)
+        self.symbols.push()
         for param in params:
-            try:
-                self.scope.define(param)
-            except ValueError as ex:
-                self.err(ctx, str(ex))
+            self._define(ctx, param)
 
         old_func = self.current_function
         self.current_function = func_sym
-        self.visit(ctx.block())
+        yield from self._function_body(ctx.block())
         self.current_function = old_func
-        self.scope = old_scope
+        self.symbols.pop()
         return None
 
 
+    # Cuerpo de una función o método, con los parámetros ya en el ámbito actual.
+    # parallel.DeclarationChecker lo redefine para diferir los cuerpos globales.
+    def _function_body(self, block):
+        return (yield block)
+
     # Classes
     def visitClassDeclaration(self, ctx):
         name = ctx.Identifier(0).getText()
         cls_sym = ClassSymbol(name=name, type=ClassType(name))
         # registra clase en ámbito y en tabla
-        try:
-            self.scope.define(cls_sym)
-        except ValueError as ex:
-            self.err(ctx, str(ex))
+        self._define(ctx, cls_sym)
         self.class_table[name] = cls_sym
 
         # recolecta miembros (campos y métodos con firmas)
@@ -352,15 +407,15 @@ class SemanticChecker(ParseTreeVisitor):
                 vname = v.Identifier().getText()
                 vtype = self._type_from_annotation(v.typeAnnotation()) or NULL
                 if vname in cls_sym.fields:
-                    self.err(v, f"Campo duplicado en clase '{name}': {vname}")
+                    self.err(v, "duplicate-field", name, vname)
                 else:
                     cls_sym.fields[vname] = VarSymbol(name=vname, type=vtype, initialized=bool(v.initializer()))
             elif m.constantDeclaration():
                 c = m.constantDeclaration()
                 cname = c.Identifier().getText()
-                ctype = self._type_from_annotation(c.typeAnnotation()) or (self.visit(c.expression()) or NULL)
+                ctype = self._type_from_annotation(c.typeAnnotation()) or ((yield c.expression()) or NULL)
                 if cname in cls_sym.fields:
-                    self.err(c, f"Campo duplicado en clase '{name}': {cname}")
+                    self.err(c, "duplicate-field", name, cname)
                 else:
                     cls_sym.fields[cname] = VarSymbol(name=cname, type=ctype, is_const=True, initialized=True)
             elif m.functionDeclaration():
@@ -375,7 +430,7 @@ class SemanticChecker(ParseTreeVisitor):
                         pt = self._type_from_type(p.type_()) if p.type_() else NULL
                         ps.append(ParamSymbol(name=p.Identifier().getText(), type=pt))
                 if fname in cls_sym.methods:
-                    self.err(f, f"Método duplicado en clase '{name}': {fname}")
+                    self.err(f, "duplicate-method", name, fname)
                 cls_sym.methods[fname] = FunctionSymbol(name=fname, type=rt, params=ps)
 
         # chequear los cuerpos de los métodos con 'this' y los params
@@ -385,42 +440,39 @@ class SemanticChecker(ParseTreeVisitor):
                 fname = f.Identifier().getText()
                 fn = cls_sym.methods[fname]
 
-                old_scope, old_func, old_cls = self.scope, self.current_function, self.current_class
-                self.scope = Scope(parent=old_scope)
+                old_func, old_cls = self.current_function, self.current_class
+                self.symbols.push()
                 self.current_function = fn
                 self.current_class = cls_sym
-                self.scope.define(VarSymbol(name="this", type=ClassType(name), initialized=True))
+                self.symbols.define(VarSymbol(name="this", type=cls_sym.type, initialized=True))
                 for p in fn.params:
-                    try:
-                        self.scope.define(p)
-                    except ValueError as ex:
-                        self.err(f, str(ex))
-                self.visit(f.block())
-                self.scope, self.current_function, self.current_class = old_scope, old_func, old_cls
+                    self._define(f, p)
+                yield from self._function_body(f.block())
+                self.symbols.pop()
+                self.current_function, self.current_class = old_func, old_cls
         return None
 
    
     # Expresiones
 
     def visitAssignExpr(self, ctx):
-        rhs_t = self.visit(ctx.assignmentExpr())
+        rhs_t = (yield ctx.assignmentExpr())
         return rhs_t
 
     def visitPropertyAssignExpr(self, ctx):
-        return self.visit(ctx.assignmentExpr())
+        return (yield ctx.assignmentExpr())
 
     def visitExprNoAssign(self, ctx):
-        return self.visit(ctx.conditionalExpr())
+        return (yield ctx.conditionalExpr())
 
     # logicalOrExpr
     def visitTernaryExpr(self, ctx):
-        has_q = any(
-            hasattr(ctx.getChild(i), "getText") and ctx.getChild(i).getText() == "?"
-            for i in range(ctx.getChildCount())
-        )
+        # logicalOrExpr ('?' expression ':' expression)?
+        second = ctx.getChild(1)
+        has_q = isinstance(second, TerminalNode) and second.symbol.type == _QUESTION
 
         # Tipo de la condición
-        cond_t = self.visit(ctx.logicalOrExpr())
+        cond_t = (yield ctx.logicalOrExpr())
 
         if not has_q:
             return cond_t
@@ -429,101 +481,109 @@ class SemanticChecker(ParseTreeVisitor):
             e1_ctx = ctx.expression(0)
             e2_ctx = ctx.expression(1)
         except Exception:
-            self.err(ctx, "Forma de operador ternario no reconocida por la gramática.")
+            self.err(ctx, "ternary-form")
             return NULL
 
-        e1_t = self.visit(e1_ctx)
-        e2_t = self.visit(e2_ctx)
+        e1_t = (yield e1_ctx)
+        e2_t = (yield e2_ctx)
 
         if not isinstance(cond_t, BooleanType):
-            self.err(ctx, "El predicado del operador ternario debe ser boolean.")
+            self.err(ctx, "ternary-condition")
 
         if not e1_t.is_compatible(e2_t):
-            self.err(ctx, "Ambas ramas del operador ternario deben tener el mismo tipo.")
+            self.err(ctx, "ternary-branches")
 
         return e1_t
 
+    # Cadenas n-arias (a || b || ..., a + b - c ...): la gramática deja todos los operandos
+    # como hijos de un mismo nodo, intercalados con los operadores. Se recorren por
+    # posición en ctx.children: ctx.equalityExpr(i) busca el i-ésimo entre todos los
+    # hijos, y una cadena de n términos costaría O(n²).
+
     def visitLogicalOrExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.logicalAndExpr(0))
-        t = BOOL
-        for i in range(len(ctx.logicalAndExpr())):
-            et = self.visit(ctx.logicalAndExpr(i))
-            if not isinstance(et, BooleanType):
-                self.err(ctx, "Operación lógica requiere booleanos.")
+        children = ctx.children
+        if len(children) == 1:
+            return (yield children[0])
+        for i in range(0, len(children), 2):
+            if not isinstance((yield children[i]), BooleanType):
+                self.err(ctx, "logical-operands")
         return BOOL
 
     def visitLogicalAndExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.equalityExpr(0))
-        for i in range(len(ctx.equalityExpr())):
-            et = self.visit(ctx.equalityExpr(i))
-            if not isinstance(et, BooleanType):
-                self.err(ctx, "Operación lógica requiere booleanos.")
+        children = ctx.children
+        if len(children) == 1:
+            return (yield children[0])
+        for i in range(0, len(children), 2):
+            if not isinstance((yield children[i]), BooleanType):
+                self.err(ctx, "logical-operands")
         return BOOL
 
     def visitEqualityExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.relationalExpr(0))
-        n = len(ctx.relationalExpr())
-        t0 = self.visit(ctx.relationalExpr(0))
-        for i in range(1, n):
-            ti = self.visit(ctx.relationalExpr(i))
+        children = ctx.children
+        if len(children) == 1:
+            return (yield children[0])
+        t0 = (yield children[0])
+        for i in range(2, len(children), 2):
+            ti = (yield children[i])
             if not t0.is_compatible(ti):
-                self.err(ctx, "Comparación entre tipos incompatibles.")
+                self.err(ctx, "equality-operands")
             t0 = ti
         return BOOL
 
     def visitRelationalExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.additiveExpr(0))
-        n = len(ctx.additiveExpr())
-        t0 = self.visit(ctx.additiveExpr(0))
-        for i in range(1, n):
-            ti = self.visit(ctx.additiveExpr(i))
-            if not (isinstance(t0, (IntegerType, FloatType)) and isinstance(ti, (IntegerType, FloatType))):
-                self.err(ctx, "Comparación relacional requiere números.")
-            t0 = ti
+        children = ctx.children
+        if len(children) == 1:
+            return (yield children[0])
+        numeric = isinstance((yield children[0]), (IntegerType, FloatType))
+        for i in range(2, len(children), 2):
+            ti_numeric = isinstance((yield children[i]), (IntegerType, FloatType))
+            if not (numeric and ti_numeric):
+                self.err(ctx, "relational-operands")
+            numeric = ti_numeric
         return BOOL
 
     def visitAdditiveExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.multiplicativeExpr(0))
-        a = self.visit(ctx.multiplicativeExpr(0))
-        b = self.visit(ctx.multiplicativeExpr(1))
-        if isinstance(a, (IntegerType, FloatType)) and isinstance(b, (IntegerType, FloatType)):
-            return FLOAT if isinstance(a, FloatType) or isinstance(b, FloatType) else INT
-        self.err(ctx, "Suma/resta requiere operandos numéricos (integer/float).")
-        return NULL
-
+        return (yield from self._numeric_chain(ctx, "additive-operands"))
 
     def visitMultiplicativeExpr(self, ctx):
-        if len(ctx.children) == 1:
-            return self.visit(ctx.unaryExpr(0))
-        a = self.visit(ctx.unaryExpr(0))
-        b = self.visit(ctx.unaryExpr(1))
-        if isinstance(a, (IntegerType, FloatType)) and isinstance(b, (IntegerType, FloatType)):
-            return FLOAT if isinstance(a, FloatType) or isinstance(b, FloatType) else INT
-        self.err(ctx, "Multiplicación/división requiere números.")
-        return NULL
+        return (yield from self._numeric_chain(ctx, "multiplicative-operands"))
+
+    def _numeric_chain(self, ctx, code):
+        """Pliega a op b op c ... de izquierda a derecha: integer mientras todos los operandos
+        lo sean, float si aparece alguno float. Un operando no numérico se reporta una vez
+        por cadena, después de visitar todos los operandos (como los demás operadores)."""
+        children = ctx.children
+        if len(children) == 1:
+            return (yield children[0])
+        result, bad = INT, False
+        for i in range(0, len(children), 2):
+            t = (yield children[i])
+            if isinstance(t, FloatType):
+                result = FLOAT
+            elif not isinstance(t, IntegerType):
+                bad = True
+        if bad:
+            self.err(ctx, code)
+            return NULL
+        return result
 
     def visitUnaryExpr(self, ctx):
         if ctx.getChildCount() == 1:
-            return self.visit(ctx.primaryExpr())
+            return (yield ctx.primaryExpr())
 
         op_text = ctx.getChild(0).getText()
-        operand_t = self.visit(ctx.unaryExpr())
+        operand_t = (yield ctx.unaryExpr())
 
         if op_text == '!':
             if not isinstance(operand_t, BooleanType):
-                self.err(ctx, "Negación lógica requiere boolean.")
+                self.err(ctx, "not-operand")
                 return NULL
             return BOOL
 
         if op_text in ('+', '-'):
             if isinstance(operand_t, (IntegerType, FloatType)):
                 return operand_t
-            self.err(ctx, "Operador unario numérico requiere operandos numéricos.")
+            self.err(ctx, "negation-operand")
             return NULL
 
         return operand_t
@@ -531,89 +591,93 @@ class SemanticChecker(ParseTreeVisitor):
     def visitPrimaryExpr(self, ctx):
         
         if ctx.literalExpr():
-            return self.visit(ctx.literalExpr())
+            return (yield ctx.literalExpr())
         if ctx.leftHandSide():
-            return self.visit(ctx.leftHandSide())
+            return (yield ctx.leftHandSide())
         if hasattr(ctx, "expression") and ctx.expression():
-            return self.visit(ctx.expression())
+            return (yield ctx.expression())
         return NULL
 
     # clasifica literales
     def visitLiteralExpr(self, ctx):
-        txt = ctx.getText()
-
-        # String
-        if len(txt) >= 2 and txt[0] == '"' and txt[-1] == '"':
-            return STR
-
-        # Booleanos
-        if txt == "true" or txt == "false":
-            return BOOL
-
-        # null
-        if txt == "null":
-            return NULL
-
-        # Array literal
+        # Array literal (antes de getText(), que recorrería todos sus elementos)
         if hasattr(ctx, "arrayLiteral") and ctx.arrayLiteral():
-            elems = ctx.arrayLiteral().expression()
-            if not elems:
-                return ArrayType(NULL)
-            first_t = self.visit(elems[0]) or NULL
-            for e in elems[1:]:
-                if not first_t.is_compatible(self.visit(e) or NULL):
-                    self.err(ctx, "Arreglo con elementos de tipos incompatibles.")
-                    return ArrayType(NULL)
-            return ArrayType(first_t)
-        if all(ch.isdigit() or ch=='.' for ch in txt) and ('.' in txt):
-         return FLOAT
-        # Entero
-        if txt.isdigit():
-            return INT
+            return (yield from self._array_literal(ctx, ctx.arrayLiteral()))
 
-        return NULL
+        # Literal, 'true', 'false' o 'null': un solo token
+        tok = ctx.start
+        if tok.type == _LITERAL:
+            return _literal_type(tok.text)
+        return _KEYWORD_TYPES.get(tok.type, NULL)
+
+    def _array_literal(self, ctx, array):
+        """Tipo de '[' e (',' e)* ']': todos los elementos deben tener el tipo del primero.
+
+        Los elementos que son un solo token Literal/true/false/null (tablas de datos de
+        cientos de miles de valores) se clasifican por tipo de token sin visitarlos; el
+        resto pasa por el visitor. Con tablas laterales se visitan todos, para que cada
+        nodo tenga su tipo."""
+        children = array.children
+        if len(children) == 2:
+            return ArrayType(NULL)
+        fast = self.node_symbols is None
+        first_t = None
+        for i in range(1, len(children), 2):
+            e = children[i]
+            tok = e.start
+            if fast and tok.tokenIndex == e.stop.tokenIndex and (tok.type == _LITERAL or tok.type in _KEYWORD_TYPES):
+                t = _literal_type(tok.text) if tok.type == _LITERAL else _KEYWORD_TYPES[tok.type]
+            else:
+                t = (yield e) or NULL
+            if first_t is None:
+                first_t = t
+            elif not first_t.is_compatible(t):
+                self.err(ctx, "array-elements")
+                return ArrayType(NULL)
+        return ArrayType(first_t)
 
     def visitLeftHandSide(self, ctx):
         base_sym = None
         pa = ctx.primaryAtom()
         t = None
 
-        if hasattr(pa, "Identifier") and pa.Identifier():
+        # Identifier o 'new' Identifier(...): en ambos se resuelve el identificador
+        atom = pa.start.type
+        if atom == _IDENTIFIER or atom == _NEW:
             name = pa.Identifier().getText()
-            sym = self.scope.resolve(name)
+            sym = self.symbols.resolve(name)
             if sym is None:
-                self.err(pa, f"Identificador no declarado: {name}")
+                self.err(pa, "undeclared-identifier", name)
                 t = NULL
             else:
+                self._note_symbol(pa.Identifier(), sym)
                 base_sym = sym
                 t = getattr(sym, "type", NULL)
 
-        elif pa.getText() == "this":
+        elif atom == _THIS:
             if self.current_class is None:
-                self.err(pa, "'this' solo puede usarse dentro de métodos de clase.")
+                self.err(pa, "this-outside-method")
                 t = NULL
             else:
-                t = ClassType(self.current_class.name)
-
-        elif pa.getChildCount() >= 2 and pa.getChild(0).getText() == "new":
-            cname = pa.getChild(1).getText()
-            t = ClassType(cname)
+                t = self.current_class.type
 
         else:
-            t = self.visit(pa)
+            t = (yield pa)
 
         # aplicar sufijos
         for op in ctx.suffixOp():
-            first_txt = op.getChild(0).getText() if op.getChildCount() > 0 else ""
+            first = op.start.type
 
-            if first_txt == "(":
+            if first == _LPAREN:
                 # recolectar argumentos
                 arg_nodes = []
                 if hasattr(op, "arguments") and op.arguments():
                     arg_nodes = self._expr_all(op.arguments())
                 else:
                     arg_nodes = self._expr_all(op)
-                arg_types = [self.visit(e) for e in arg_nodes]
+                arg_types = []
+                for e in arg_nodes:
+                    arg_types.append((yield e))
 
                 fn = None
                 if isinstance(base_sym, FunctionSymbol):
@@ -625,11 +689,11 @@ class SemanticChecker(ParseTreeVisitor):
 
                 if fn is not None:
                     if len(arg_types) != len(fn.params):
-                        self.err(op, f"La función '{fn.name}' espera {len(fn.params)} argumentos, pero recibió {len(arg_types)}.")
+                        self.err(op, "arity", fn.name, len(fn.params), len(arg_types))
                     else:
                         for i, (pt, at) in enumerate(zip([p.type for p in fn.params], arg_types)):
                             if not pt.is_compatible(at):
-                                self.err(op, f"Argumento {i+1} de '{fn.name}' debe ser {pt}, pero recibió {at}.")
+                                self.err(op, "argument-mismatch", i + 1, fn.name, pt, at)
                     t = fn.type
                     base_sym = None
                     continue
@@ -637,31 +701,31 @@ class SemanticChecker(ParseTreeVisitor):
                 if isinstance(base_sym, FunctionSymbol):
                     pass
                 else:
-                    self.err(op, "Llamada aplicada a algo que no es función declarada.")
+                    self.err(op, "not-callable")
                     t = NULL
 
             # indexación
-            elif first_txt == "[":
+            elif first == _LBRACKET:
                 # índice
                 idx_node = None
                 if hasattr(op, "expression"):
                     xs = op.expression()
                     idx_node = xs[0] if isinstance(xs, list) and xs else (xs if xs else None)
                 if not isinstance(t, ArrayType):
-                    self.err(op, "Indexación requiere un arreglo.")
+                    self.err(op, "index-non-array")
                     t = NULL
                 else:
                     if idx_node is not None:
-                        it = self.visit(idx_node)
+                        it = (yield idx_node)
                         if not isinstance(it, IntegerType):
-                            self.err(op, "El índice de un arreglo debe ser integer.")
+                            self.err(op, "index-not-integer")
                     t = t.elem
                 base_sym = None
 
             # acceso a propiedad: '.' Identifier
-            elif first_txt == ".":
+            elif first == _DOT:
                 if not isinstance(t, ClassType):
-                    self.err(op, "Acceso a propiedad sobre algo que no es objeto/clase.")
+                    self.err(op, "member-on-non-object")
                     t = NULL
                     base_sym = None
                     continue
@@ -669,19 +733,21 @@ class SemanticChecker(ParseTreeVisitor):
                 member = op.getChild(1).getText()
                 cls = self.class_table.get(t.name)
                 if not cls:
-                    self.err(op, f"Clase '{t.name}' no declarada.")
+                    self.err(op, "undeclared-class", t.name)
                     t = NULL
                     base_sym = None
                     continue
 
                 if member in cls.fields:
                     t = cls.fields[member].type
+                    self._note_symbol(op.getChild(1), cls.fields[member])
                     base_sym = None
                 elif member in cls.methods:
                     base_sym = cls.methods[member]
+                    self._note_symbol(op.getChild(1), base_sym)
                     t = base_sym.type
                 else:
-                    self.err(op, f"'{t.name}' no tiene miembro '{member}'.")
+                    self.err(op, "no-such-member", t.name, member)
                     t = NULL
                     base_sym = None
 
@@ -690,22 +756,21 @@ class SemanticChecker(ParseTreeVisitor):
 
 
     def visitPrimaryAtom(self, ctx):
-        if hasattr(ctx, "Identifier") and ctx.Identifier():
+        atom = ctx.start.type
+        if atom == _IDENTIFIER or atom == _NEW:
             name = ctx.Identifier().getText()
-            sym = self.scope.resolve(name)
+            sym = self.symbols.resolve(name)
             if sym is None:
-                self.err(ctx, f"Identificador no declarado: {name}")
+                self.err(ctx, "undeclared-identifier", name)
                 return NULL
+            self._note_symbol(ctx.Identifier(), sym)
             return getattr(sym, "type", NULL)
 
-        if ctx.getText() == "this":
+        if atom == _THIS:
             if self.current_class is None:
-                self.err(ctx, "'this' solo puede usarse dentro de métodos de clase.")
+                self.err(ctx, "this-outside-method")
                 return NULL
-            return ClassType(self.current_class.name)
-
-        if ctx.getChildCount() >= 2 and ctx.getChild(0).getText() == "new":
-            return ClassType(ctx.getChild(1).getText())
+            return self.current_class.type
 
         return NULL
 
@@ -714,9 +779,9 @@ class SemanticChecker(ParseTreeVisitor):
         return NULL
 
     def visitIndexExpr(self, ctx):
-        arr_t = self.visit(ctx.expression())
+        arr_t = (yield ctx.expression())
         if not isinstance(arr_t, ArrayType):
-            self.err(ctx, "Indexación requiere un arreglo.")
+            self.err(ctx, "index-non-array")
             return NULL
         return arr_t.elem
 
@@ -747,39 +812,25 @@ class SemanticChecker(ParseTreeVisitor):
     def _type_from_type(self, tctx):
         return self._type_from_typectx(tctx)
     
-    # Normaliza el texto del contexto de tipo, incluyendo arreglos 
+    # type: baseType ('[' ']')*  ->  (texto del tipo base, cantidad de '[]'), sin getText()
     def _type_from_typectx(self, tctx):
         if tctx is None:
             return NULL
-        txt = tctx.getText()
-        dims = 0
-        while txt.endswith("[]"):
-            dims += 1
-            txt = txt[:-2]
-        base = {
-            "integer": INT,
-            "float":   FLOAT,
-            "string":  STR,
-            "boolean": BOOL,
-            "null":    NULL
-        }.get(txt, ClassType(txt))
-        for _ in range(dims):
-            base = ArrayType(base)
-        return base
+        return type_from_annotation(tctx.start.text, (tctx.getChildCount() - 1) // 2)
 
     def _infer_type(self, expr_ctx):
         if expr_ctx is None: return NULL
-        return self.visit(expr_ctx)
+        return (yield expr_ctx)
     def visitSwitchStatement(self, ctx):
-        cond_t = self.visit(ctx.expression())
+        cond_t = (yield ctx.expression())
         if not isinstance(cond_t, BooleanType):
-            self.err(ctx, "La expresión de 'switch' debe ser boolean.")
+            self.err(ctx, "switch-not-boolean")
         for sc in ctx.switchCase():
             for st in sc.statement():
-                self.visit(st)
+                (yield st)
         if ctx.defaultCase():
             for st in ctx.defaultCase().statement():
-                self.visit(st)
+                (yield st)
     def _is_terminal_stmt(self, st):
             try:
                 return bool(st.returnStatement() or st.breakStatement() or st.continueStatement())
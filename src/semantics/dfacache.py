@@ -0,0 +1,259 @@
+import marshal, os, tempfile
+
+from antlr4.PredictionContext import (PredictionContext, SingletonPredictionContext,
+                                      ArrayPredictionContext)
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerATNSimulator import LexerATNSimulator
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import SemanticContext
+from antlr4.dfa.DFAState import DFAState
+
+from CompiscriptLexer import CompiscriptLexer
+from CompiscriptParser import CompiscriptParser
+from .cachedir import cache_dir, grammar_hash, runtime_tag
+
+# Snapshot en disco de los DFA de predicción de CompiscriptLexer/CompiscriptParser.
+#
+# Los DFA son atributos de clase y se llenan a medida que se parsea; un proceso nuevo
+# los reconstruye desde cero. Aquí se guardan como tuplas planas (marshal): estados ATN
+# por número, contextos de predicción en una tabla y aristas por número de estado DFA.
+# Al cargar se reconstruyen los objetos y se recalculan los hashes, porque el hash de
+# EMPTY depende de hash("") y cambia entre procesos.
+
+FORMAT_VERSION = 1
+_ERROR_EDGE = -1
+_NO_PARENT = -1
+
+# Estados agregados por load(); save() solo escribe si hay más que estos
+_loaded_states = 0
+
+
+class _Unsupported(Exception):
+    """El DFA contiene predicados o acciones dependientes de posición: no se persiste."""
+
+
+def default_path() -> str:
+    return os.path.join(cache_dir(), f"dfa-{grammar_hash()[:16]}-{runtime_tag()}.bin")
+
+
+def _recognizers():
+    return ((CompiscriptLexer, True, LexerATNSimulator.ERROR),
+            (CompiscriptParser, False, ATNSimulator.ERROR))
+
+
+def state_count() -> int:
+    return sum(len(dfa.states) for cls, _, _ in _recognizers() for dfa in cls.decisionsToDFA)
+
+
+# ---------- Codificación ----------
+class _Encoder:
+    def __init__(self, atn, lexer, error):
+        self.lexer = lexer
+        self.error = error
+        self.actions = {id(a): i for i, a in enumerate(atn.lexerActions or [])}
+        self.contexts = []
+        self.context_ids = {}
+
+    def context(self, ctx):
+        if ctx is None:
+            return _NO_PARENT
+        key = id(ctx)
+        cid = self.context_ids.get(key)
+        if cid is not None:
+            return cid
+        if ctx is PredictionContext.EMPTY:
+            entry = ("E",)
+        elif isinstance(ctx, ArrayPredictionContext):
+            entry = ("A", tuple(self.context(p) for p in ctx.parents), tuple(ctx.returnStates))
+        elif isinstance(ctx, SingletonPredictionContext):
+            entry = ("S", self.context(ctx.parentCtx), ctx.returnState)
+        else:
+            raise _Unsupported(type(ctx).__name__)
+        cid = self.context_ids[key] = len(self.contexts)
+        self.contexts.append(entry)
+        return cid
+
+    def executor(self, ex):
+        if ex is None:
+            return None
+        try:
+            return tuple(self.actions[id(a)] for a in ex.lexerActions)
+        except KeyError:
+            raise _Unsupported("acción léxica dependiente de posición")
+
+    def config(self, c):
+        if c.semanticContext is not SemanticContext.NONE:
+            raise _Unsupported("predicado semántico")
+        data = (c.state.stateNumber, c.alt, self.context(c.context),
+                c.reachesIntoOuterContext, c.precedenceFilterSuppressed)
+        if self.lexer:
+            data += (self.executor(c.lexerActionExecutor), c.passedThroughNonGreedyDecision)
+        return data
+
+    def configs(self, cs):
+        alts = tuple(sorted(cs.conflictingAlts)) if cs.conflictingAlts is not None else None
+        return (cs.fullCtx, cs.uniqueAlt, alts, cs.hasSemanticContext, cs.dipsIntoOuterContext,
+                tuple(self.config(c) for c in cs.configs))
+
+    def state(self, s):
+        if s.predicates is not None:
+            raise _Unsupported("predicados en estado DFA")
+        edges = None
+        if s.edges is not None:
+            edges = (len(s.edges), tuple(
+                (i, _ERROR_EDGE if t is self.error else t.stateNumber)
+                for i, t in enumerate(s.edges) if t is not None))
+        return (s.stateNumber, s.isAcceptState, s.prediction, s.requiresFullContext,
+                self.executor(s.lexerActionExecutor), edges, self.configs(s.configs))
+
+    def dfa(self, dfa):
+        if dfa.precedenceDfa:
+            raise _Unsupported("DFA de precedencia")
+        s0 = dfa.s0.stateNumber if dfa.s0 is not None else None
+        return (dfa.decision, s0, tuple(self.state(s) for s in dfa.states))
+
+
+def _encode(cls, lexer, error):
+    enc = _Encoder(cls.atn, lexer, error)
+    dfas = []
+    for dfa in cls.decisionsToDFA:
+        if not dfa.states:
+            continue
+        try:
+            dfas.append(enc.dfa(dfa))
+        except _Unsupported:
+            continue
+    return (tuple(enc.contexts), tuple(dfas))
+
+
+# ---------- Decodificación ----------
+def _decode_contexts(entries):
+    contexts = []
+    for entry in entries:
+        kind = entry[0]
+        if kind == "E":
+            ctx = PredictionContext.EMPTY
+        elif kind == "S":
+            parent = contexts[entry[1]] if entry[1] != _NO_PARENT else None
+            ctx = SingletonPredictionContext.create(parent, entry[2])
+        else:
+            parents = [contexts[p] if p != _NO_PARENT else None for p in entry[1]]
+            ctx = ArrayPredictionContext(parents, list(entry[2]))
+        contexts.append(ctx)
+    return contexts
+
+
+def _decode(cls, lexer, error, data):
+    atn = cls.atn
+    states = atn.states
+    actions = atn.lexerActions
+    executors = {}
+    context_entries, dfas = data
+    contexts = _decode_contexts(context_entries)
+
+    def executor(ids):
+        if ids is None:
+            return None
+        ex = executors.get(ids)
+        if ex is None:
+            ex = executors[ids] = LexerActionExecutor([actions[i] for i in ids])
+        return ex
+
+    loaded = 0
+    for decision, s0, encoded_states in dfas:
+        dfa = cls.decisionsToDFA[decision]
+        if dfa.states or dfa.s0 is not None:
+            continue  # ya tiene estados en este proceso
+
+        by_number = {}
+        for number, accept, prediction, full_ctx, ex_ids, edges, cs_data in encoded_states:
+            fullCtx, uniqueAlt, alts, hasSem, dips, cfgs = cs_data
+            cs = ATNConfigSet(fullCtx)
+            for cfg in cfgs:
+                if lexer:
+                    c = LexerATNConfig(states[cfg[0]], cfg[1], contexts[cfg[2]],
+                                       lexerActionExecutor=executor(cfg[5]))
+                    c.passedThroughNonGreedyDecision = cfg[6]
+                else:
+                    c = ATNConfig(states[cfg[0]], cfg[1], contexts[cfg[2]])
+                c.reachesIntoOuterContext = cfg[3]
+                c.precedenceFilterSuppressed = cfg[4]
+                cs.configs.append(c)
+            cs.uniqueAlt = uniqueAlt
+            cs.conflictingAlts = set(alts) if alts is not None else None
+            cs.hasSemanticContext = hasSem
+            cs.dipsIntoOuterContext = dips
+            cs.setReadonly(True)
+
+            s = DFAState(number, cs)
+            s.isAcceptState = accept
+            s.prediction = prediction
+            s.requiresFullContext = full_ctx
+            s.lexerActionExecutor = executor(ex_ids)
+            s.edges = edges
+            by_number[number] = s
+
+        for s in by_number.values():
+            if s.edges is not None:
+                size, targets = s.edges
+                s.edges = [None] * size
+                for i, t in targets:
+                    s.edges[i] = error if t == _ERROR_EDGE else by_number[t]
+            dfa.states[s] = s
+        dfa.s0 = by_number[s0] if s0 is not None else None
+        loaded += len(by_number)
+    return loaded
+
+
+# ---------- API ----------
+def load(path: str = None) -> int:
+    """Carga el snapshot en los DFA vacíos. Devuelve cuántos estados se agregaron."""
+    global _loaded_states
+    path = path or default_path()
+    try:
+        with open(path, "rb") as f:
+            version, key, lexer_data, parser_data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return 0
+    if version != FORMAT_VERSION or key != grammar_hash():
+        return 0
+
+    loaded = 0
+    for (cls, lexer, error), data in zip(_recognizers(), (lexer_data, parser_data)):
+        try:
+            loaded += _decode(cls, lexer, error, data)
+        except (IndexError, KeyError, TypeError, ValueError):
+            # Snapshot inconsistente: se descartan los DFA de este reconocedor
+            for dfa in cls.decisionsToDFA:
+                dfa.states.clear()
+                dfa.s0 = None
+    _loaded_states = state_count()
+    return loaded
+
+
+def save(path: str = None, force: bool = False) -> bool:
+    """Escribe el snapshot si los DFA crecieron desde load(). Escritura atómica."""
+    global _loaded_states
+    count = state_count()
+    if not force and count <= _loaded_states:
+        return False
+    path = path or default_path()
+    data = (FORMAT_VERSION, grammar_hash()) + tuple(
+        _encode(cls, lexer, error) for cls, lexer, error in _recognizers())
+
+    directory = os.path.dirname(path) or "."
+    tmp = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, prefix=".dfa-")
+        with os.fdopen(fd, "wb") as f:
+            marshal.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        if tmp is not None and os.path.exists(tmp):
+            os.unlink(tmp)
+        return False
+    _loaded_states = count
+    return True
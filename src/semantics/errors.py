@@ -1,14 +1,93 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
 from antlr4.error.ErrorListener import ErrorListener
 
+# Diagnósticos
+#
+# Cada error se guarda como un Diagnostic (código del mensaje + posición + argumentos)
+# y el texto se arma recién con str(), al imprimirlo. Un archivo patológico puede
+# producir cientos de miles de errores en cascada; con max_errors el análisis se corta
+# lanzando TooManyErrors apenas se alcanza el tope.
+
+MESSAGES = {
+    "syntax": "{0}",
+    "cannot-infer": "No se puede inferir el tipo de '{0}' sin anotación ni inicializador.",
+    "redeclared": "Redeclaración en el mismo ámbito: {0}",
+    "variable-mismatch": "Asignación incompatible: variable '{0}' es {1} pero expresión es {2}.",
+    "constant-mismatch": "Constante '{0}' declarada como {1} pero inicializa con {2}.",
+    "undeclared-variable": "Variable no declarada: {0}",
+    "constant-assignment": "No se puede asignar a constante '{0}'.",
+    "property-on-non-object": "La asignación de propiedad requiere un objeto.",
+    "undeclared-class": "Clase '{0}' no declarada.",
+    "no-such-field": "La clase '{0}' no tiene campo '{1}'.",
+    "constant-field-assignment": "No se puede asignar al campo constante '{0}'.",
+    "field-mismatch": "Asignación incompatible: campo '{0}' es {1} pero expresión es {2}.",
+    "condition-not-boolean": "La condición de '{0}' debe ser boolean.",
+    "foreach-not-array": "El 'foreach' requiere iterar sobre un arreglo.",
+    "outside-loop": "'{0}' solo se permite dentro de bucles.",
+    "return-outside-function": "'return' solo se permite dentro de una función.",
+    "return-mismatch": "El 'return' devuelve {0} pero la función retorna {1}.",
+    "unreachable": "Código inalcanzable después de una instrucción de terminación.",
+    "duplicate-field": "Campo duplicado en clase '{0}': {1}",
+    "duplicate-method": "Método duplicado en clase '{0}': {1}",
+    "ternary-form": "Forma de operador ternario no reconocida por la gramática.",
+    "ternary-condition": "El predicado del operador ternario debe ser boolean.",
+    "ternary-branches": "Ambas ramas del operador ternario deben tener el mismo tipo.",
+    "logical-operands": "Operación lógica requiere booleanos.",
+    "equality-operands": "Comparación entre tipos incompatibles.",
+    "relational-operands": "Comparación relacional requiere números.",
+    "additive-operands": "Suma/resta requiere operandos numéricos (integer/float).",
+    "multiplicative-operands": "Multiplicación/división requiere números.",
+    "not-operand": "Negación lógica requiere boolean.",
+    "negation-operand": "Operador unario numérico requiere operandos numéricos.",
+    "array-elements": "Arreglo con elementos de tipos incompatibles.",
+    "undeclared-identifier": "Identificador no declarado: {0}",
+    "this-outside-method": "'this' solo puede usarse dentro de métodos de clase.",
+    "arity": "La función '{0}' espera {1} argumentos, pero recibió {2}.",
+    "argument-mismatch": "Argumento {0} de '{1}' debe ser {2}, pero recibió {3}.",
+    "not-callable": "Llamada aplicada a algo que no es función declarada.",
+    "index-non-array": "Indexación requiere un arreglo.",
+    "index-not-integer": "El índice de un arreglo debe ser integer.",
+    "member-on-non-object": "Acceso a propiedad sobre algo que no es objeto/clase.",
+    "no-such-member": "'{0}' no tiene miembro '{1}'.",
+    "switch-not-boolean": "La expresión de 'switch' debe ser boolean.",
+}
+
+@dataclass(frozen=True, slots=True)
+class Diagnostic:
+    kind: str            # "SyntaxError" | "SemanticError"
+    code: str            # clave en MESSAGES
+    line: int
+    col: int
+    args: Tuple = ()     # valores sin formatear (nombres, tipos, cantidades)
+    severity: str = "error"
+
+    @property
+    def message(self) -> str:
+        return MESSAGES[self.code].format(*self.args)
+
+    def __str__(self):
+        return f"[{self.kind}] L{self.line}:C{self.col} {self.message}"
+
+class TooManyErrors(Exception):
+    """Apareció un error más allá de max_errors; quien corre el análisis la atrapa y
+    conserva los max_errors ya reportados."""
+
 class SyntaxErrorListener(ErrorListener):
-    def __init__(self):
+    def __init__(self, max_errors: Optional[int] = None):
         super().__init__()
         self.errors = []
         self.has_errors = False
+        self.max_errors = max_errors
+        self.truncated = False  # True si se cortó por max_errors
 
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
         self.has_errors = True
-        self.errors.append(f"[SyntaxError] L{line}:C{column} {msg}")
+        if len(self.errors) == self.max_errors:
+            self.truncated = True
+            raise TooManyErrors()
+        self.errors.append(Diagnostic("SyntaxError", "syntax", line, column, (msg,)))
 
 class SemanticError(Exception):
     pass
@@ -0,0 +1,124 @@
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from .errors import Diagnostic
+from .parallel import BodyJob, DeclarationChecker, _BodyEnv, merge_errors, plan_bodies
+from .parsing import PREDICTION_LL
+from .session import CompileResult, CompilerSession
+from .symbols import ClassSymbol, FunctionSymbol, Symbol, VarSymbol
+
+# Re-chequeo incremental de un archivo que se edita (IDE, modo watch).
+#
+# Se apoya en las dos fases de semantics.parallel: la fase 1 (declaraciones y sentencias
+# globales, sobre el esqueleto con los cuerpos vacíos) se corre en cada check(), y de cada
+# cuerpo de función o método se guardan sus errores y los nombres que buscó
+# (SemanticChecker(track_dependencies=True)) junto con la firma de lo que resolvía cada
+# uno en su posición. En el siguiente check() un cuerpo se vuelve a chequear solo si
+# cambió su texto, su firma o la de su clase, o la firma de alguna de sus dependencias.
+
+
+def fingerprint(sym: Optional[Symbol]) -> Hashable:
+    """Lo que el chequeo de otro código puede observar de un símbolo."""
+    if sym is None:
+        return None
+    if isinstance(sym, ClassSymbol):
+        return ("class", sym.name,
+                tuple((name, fingerprint(f)) for name, f in sym.fields.items()),
+                tuple((name, fingerprint(m)) for name, m in sym.methods.items()),
+                sym.base.name if sym.base is not None else None)
+    if isinstance(sym, FunctionSymbol):
+        return ("function", sym.name, sym.type, tuple((p.name, p.type) for p in sym.params))
+    if isinstance(sym, VarSymbol):
+        return ("var", sym.name, sym.type, sym.is_const)
+    return (type(sym).__name__, sym.name, sym.type)
+
+
+class _GlobalView:
+    """Ámbito global y tabla de clases de la fase 1, consultables en la posición de un cuerpo."""
+
+    def __init__(self, checker: DeclarationChecker):
+        self.global_symbols = checker.symbols.global_symbols()
+        self.class_log = checker.class_table.log
+        self._index = {sym.name: i for i, sym in enumerate(self.global_symbols)}
+        self._classes: Dict[str, List[Tuple[int, ClassSymbol]]] = {}
+        for pos, (name, cls_sym) in enumerate(self.class_log):
+            self._classes.setdefault(name, []).append((pos, cls_sym))
+
+    def lookup(self, name: str, job: BodyJob) -> Hashable:
+        i = self._index.get(name)
+        sym = self.global_symbols[i] if i is not None and i < job.n_globals else None
+        cls_sym = None
+        for pos, c in self._classes.get(name, ()):
+            if pos >= job.n_classes:
+                break
+            cls_sym = c
+        return fingerprint(sym), fingerprint(cls_sym)
+
+
+@dataclass
+class _BodyEntry:
+    deps: Tuple[Tuple[str, Hashable], ...]    # (nombre buscado, firma de lo que resolvía)
+    errors: List[Diagnostic]                  # relativos al texto del cuerpo
+
+
+@dataclass
+class IncrementalStats:
+    checked: int = 0
+    reused: int = 0
+
+    def __str__(self):
+        return f"{self.checked} cuerpos chequeados, {self.reused} reutilizados"
+
+
+def _unit_name(job: BodyJob) -> str:
+    return f"{job.cls.name}.{job.function.name}" if job.cls is not None else job.function.name
+
+
+class IncrementalChecker:
+    """Chequea versiones sucesivas de un mismo archivo reutilizando los cuerpos que no cambiaron.
+
+    check() devuelve lo mismo que CompilerSession.compile_source() (sin árbol). Tras cada
+    llamada, `stats` dice cuántos cuerpos se chequearon y cuántos se reutilizaron, y
+    `dependencies` tiene, por función o método (`Clase.metodo`), los nombres que busca.
+    """
+
+    def __init__(self, prediction: str = PREDICTION_LL, max_errors: Optional[int] = None):
+        self.session = CompilerSession(prediction, max_errors=max_errors)
+        self.stats = IncrementalStats()
+        self.dependencies: Dict[str, FrozenSet[str]] = {}
+        self._bodies: Dict[tuple, _BodyEntry] = {}
+
+    def check(self, code: str) -> CompileResult:
+        self.stats = IncrementalStats()
+        planned = plan_bodies(self.session, code)
+        if planned is None:
+            return self.session.compile_source(code)
+        parser, checker, work = planned
+
+        view = _GlobalView(checker)
+        env = None
+        bodies, results, dependencies = {}, [], {}
+        for job in work:
+            key = (job.text, fingerprint(job.function), fingerprint(job.cls))
+            entry = self._bodies.get(key)
+            if entry is not None and all(view.lookup(name, job) == fp for name, fp in entry.deps):
+                self.stats.reused += 1
+            else:
+                if env is None:
+                    env = _BodyEnv(self.session.prediction, view.global_symbols, view.class_log,
+                                   self.session.max_errors, track_dependencies=True)
+                errors = env.check(job)
+                if errors is None:
+                    self._bodies = {}
+                    return self.session.compile_source(code)
+                used = sorted(env.checker.dependencies)
+                entry = _BodyEntry(tuple((name, view.lookup(name, job)) for name in used), list(errors))
+                self.stats.checked += 1
+            bodies[key] = entry
+            results.append(entry.errors)
+            dependencies[_unit_name(job)] = frozenset(name for name, _ in entry.deps)
+
+        self._bodies = bodies
+        self.dependencies = dependencies
+        errors, truncated = merge_errors(checker, work, results, self.session.max_errors)
+        return CompileResult(tree=None, parser=parser, semantic_errors=errors, checker=checker, truncated=truncated)
@@ -0,0 +1,166 @@
+import re
+import sys
+
+from antlr4 import Token
+from antlr4.Lexer import Lexer
+from antlr4.error.Errors import LexerNoViableAltException
+
+from CompiscriptLexer import CompiscriptLexer
+
+# Lexer alternativo a CompiscriptLexer (el generado por ANTLR, que simula el ATN del
+# lexer carácter por carácter): una sola regex compilada con una alternativa por clase de
+# token. Emite los mismos tipos de token, canal, posiciones (start/stop, línea, columna)
+# y errores 'token recognition error' que el generado, así que se enchufa igual a un
+# CommonTokenStream. tests/test_lexer.py lo compara contra CompiscriptLexer.
+#
+# ANTLR elige el match más largo y, a igual largo, la regla declarada primero; la regex
+# toma la primera alternativa que matchea, así que el orden de las alternativas reproduce
+# eso: comentarios antes que '/', float antes que integer, operadores de dos caracteres
+# antes que los de uno, y las palabras clave se separan de los identificadores después.
+# Si cambia la sección de reglas léxicas de Compiscript.g4 hay que actualizar _TOKEN_RE.
+
+LEXER_ANTLR = "antlr"
+LEXER_REGEX = "regex"
+LEXER_MODES = (LEXER_ANTLR, LEXER_REGEX)
+
+_LITERAL_TOKENS = {name[1:-1]: ttype for ttype, name in enumerate(CompiscriptLexer.literalNames)
+                   if name.startswith("'")}
+_KEYWORDS = {text: ttype for text, ttype in _LITERAL_TOKENS.items() if text.isalpha()}
+_OPERATORS = sorted((text for text in _LITERAL_TOKENS if not text.isalpha()), key=len, reverse=True)
+
+_WS, _COMMENT, _LITERAL, _WORD, _OP = range(1, 6)
+_TOKEN_RE = re.compile(
+    r"([ \t\r\n]+)"                             # WS (skip)
+    r"|(//[^\r\n]*|/\*[\s\S]*?\*/)"             # COMMENT, MULTILINE_COMMENT (skip)
+    r'|([0-9]+\.[0-9]+|[0-9]+|"[^"\r\n]*")'     # Literal: Float | Integer | String
+    r"|([a-zA-Z_][a-zA-Z0-9_]*)"                # palabra clave o Identifier
+    r"|(" + "|".join(map(re.escape, _OPERATORS)) + ")")
+
+# Prefijos viables que no llegan a ser token: ANTLR avanza hasta el primer carácter que
+# ninguna regla acepta y reporta el texto hasta él inclusive
+_UNTERMINATED_STRING = re.compile(r'"[^"\r\n]*')
+_PARTIAL_OPERATORS = frozenset(op[0] for op in _OPERATORS if len(op) > 1 and op[0] not in _LITERAL_TOKENS)
+
+
+class RegexLexer(Lexer):
+    """Reemplazo de CompiscriptLexer basado en una regex; mismos tokens y errores."""
+
+    grammarFileName = CompiscriptLexer.grammarFileName
+    literalNames = CompiscriptLexer.literalNames
+    symbolicNames = CompiscriptLexer.symbolicNames
+    ruleNames = CompiscriptLexer.ruleNames
+    modeNames = CompiscriptLexer.modeNames
+    channelNames = CompiscriptLexer.channelNames
+
+    def __init__(self, input=None, output=sys.stdout):
+        super().__init__(input, output)
+        self._load()
+
+    def _load(self):
+        stream = self._input
+        self._code = stream.getText(0, stream.size - 1) if stream is not None else ""
+        self._pos = 0
+        self._line = 1
+        self._line_start = 0    # índice del primer carácter de la línea actual
+
+    def reset(self):
+        self._token = None
+        self._hitEOF = False
+        if self._input is not None:
+            self._input.seek(0)
+        self._load()
+
+    @property
+    def inputStream(self):
+        return self._input
+
+    @inputStream.setter
+    def inputStream(self, input):
+        self._input = input
+        self._tokenFactorySourcePair = (self, input)
+        self.reset()
+
+    @property
+    def line(self):
+        return self._line
+
+    @property
+    def column(self):
+        return self._pos - self._line_start
+
+    def getCharIndex(self):
+        return self._pos
+
+    def _advance(self, end: int):
+        code, pos = self._code, self._pos
+        newlines = code.count("\n", pos, end)
+        if newlines:
+            self._line += newlines
+            self._line_start = code.rfind("\n", pos, end) + 1
+        self._pos = end
+
+    def next_fields(self):
+        """(tipo, start, stop, línea, columna) del siguiente token, sin crear el objeto
+        token (ver tokens.ArrayTokenStream); al final, los de EOF."""
+        code = self._code
+        match = _TOKEN_RE.match
+        while True:
+            start = self._pos
+            m = match(code, start)
+            if m is None:
+                if start >= len(code):
+                    return Token.EOF, start, start - 1, self._line, start - self._line_start
+                self._recognition_error(start)
+                continue
+            kind = m.lastindex
+            end = m.end()
+            if kind <= _COMMENT:
+                self._advance(end)
+                continue
+            if kind == _LITERAL:
+                ttype = CompiscriptLexer.Literal
+            elif kind == _WORD:
+                ttype = _KEYWORDS.get(m.group(kind), CompiscriptLexer.Identifier)
+            else:
+                ttype = _LITERAL_TOKENS[m.group(kind)]
+            self._pos = end
+            return ttype, start, end - 1, self._line, start - self._line_start
+
+    def nextToken(self):
+        ttype, start, stop, line, column = self.next_fields()
+        token = self._factory.create(self._tokenFactorySourcePair, ttype, None, Token.DEFAULT_CHANNEL,
+                                     start, stop, line, column)
+        self._token = token
+        return token
+
+    def emitEOF(self):
+        eof = self._factory.create(self._tokenFactorySourcePair, Token.EOF, None, Token.DEFAULT_CHANNEL,
+                                   self._pos, self._pos - 1, self._line, self.column)
+        self._token = eof
+        return eof
+
+    def _recognition_error(self, start: int):
+        """Igual que Lexer.notifyListeners + recover: reporta el texto desde `start` hasta
+        el carácter que ninguna regla acepta (inclusive) y descarta ese carácter."""
+        code = self._code
+        if code[start] == '"':
+            fail = _UNTERMINATED_STRING.match(code, start).end()
+        elif code[start] in _PARTIAL_OPERATORS:
+            fail = start + 1
+        else:
+            fail = start
+        self._tokenStartCharIndex = start
+        self._tokenStartLine, self._tokenStartColumn = self._line, start - self._line_start
+        msg = "token recognition error at: '" + self.getErrorDisplay(code[start:fail + 1]) + "'"
+        self.getErrorListenerDispatch().syntaxError(
+            self, None, self._tokenStartLine, self._tokenStartColumn, msg,
+            LexerNoViableAltException(self, self._input, start, None))
+        self._advance(min(fail + 1, len(code)))
+
+
+def create_lexer(lexer: str = LEXER_ANTLR, input_stream=None) -> Lexer:
+    if lexer == LEXER_ANTLR:
+        return CompiscriptLexer(input_stream)
+    if lexer == LEXER_REGEX:
+        return RegexLexer(input_stream)
+    raise ValueError(f"Lexer desconocido: {lexer}")
@@ -0,0 +1,91 @@
+import mmap
+import re
+
+from antlr4 import InputStream, Token
+
+# Entrada de archivos sin copias completas en memoria.
+#
+# FileStream lee el archivo, lo decodifica a un str y además arma la lista de code points
+# (un int por carácter, 8 bytes por puntero): unas 9 veces el tamaño de un archivo ASCII.
+# open_stream() mapea el archivo con mmap y, si es ASCII puro (lo habitual en código
+# generado), LA() lee directamente los bytes mapeados, que son los code points. Si tiene
+# caracteres no ASCII se decodifica una vez a str y LA() calcula cada code point al
+# pedirlo, sin la lista.
+#
+# El mmap mantiene abierto un descriptor del archivo (y en Windows lo bloquea) hasta que
+# se cierra: close() o `with open_stream(...) as stream`. Después de cerrarlo el stream y
+# los tokens que leen su texto ya no sirven, así que solo se cierra cuando el resultado
+# ya no lo necesita (batch.check_file, que guarda los diagnósticos como texto).
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class _MappedFile:
+    """close() y protocolo de context manager para los streams de open_stream."""
+
+    def close(self):
+        close = getattr(self.buffer, "close", None)   # b"" de un archivo vacío no se cierra
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MmapInputStream(_MappedFile, InputStream):
+    """InputStream sobre un archivo ASCII mapeado en memoria."""
+
+    def __init__(self, fileName: str, buffer):
+        self.name = self.fileName = fileName
+        self.buffer = buffer
+        self.data = buffer          # buffer[i] es el byte como int: el code point en ASCII
+        self._index = 0
+        self._size = len(buffer)
+
+    def getText(self, start: int, stop: int):
+        if stop >= self._size:
+            stop = self._size - 1
+        if start >= self._size:
+            return ""
+        return self.buffer[start:stop + 1].decode("ascii")
+
+    def __str__(self):
+        return self.getText(0, self._size - 1)
+
+
+class TextInputStream(_MappedFile, InputStream):
+    """InputStream sobre texto ya decodificado, sin la lista de code points."""
+
+    def __init__(self, fileName: str, buffer, text: str):
+        self.name = self.fileName = fileName
+        self.buffer = buffer
+        self.strdata = text
+        self._index = 0
+        self._size = len(text)
+
+    def LA(self, offset: int):
+        if offset == 0:
+            return 0
+        if offset < 0:
+            offset += 1
+        pos = self._index + offset - 1
+        if pos < 0 or pos >= self._size:
+            return Token.EOF
+        return ord(self.strdata[pos])
+
+
+def open_stream(fileName: str, encoding: str = "utf-8") -> InputStream:
+    """Reemplazo de FileStream(fileName, encoding). El stream resultante tiene `buffer`
+    con los bytes del archivo (el mmap), válido hasta stream.close().
+    Lanza OSError o UnicodeDecodeError como FileStream."""
+    with open(fileName, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío: no se puede mapear
+            buffer = b""
+    if _NON_ASCII.search(buffer) is None:
+        return MmapInputStream(fileName, buffer)
+    return TextInputStream(fileName, buffer, str(buffer, encoding))
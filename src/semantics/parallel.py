@@ -0,0 +1,283 @@
+import os
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+from antlr4 import InputStream
+
+from CompiscriptLexer import CompiscriptLexer
+from . import dfacache
+from .checker import SemanticChecker
+from .errors import Diagnostic, SyntaxErrorListener, TooManyErrors
+from .lexer import RegexLexer
+from .parsing import PREDICTION_LL
+from .session import CompileResult, CompilerSession
+from .symbols import ClassSymbol, FunctionSymbol, Symbol, VarSymbol
+
+# Chequeo en dos fases, con los cuerpos de funciones repartidos en un pool de procesos.
+#
+# Fase 1 (proceso principal): se lexea el archivo (con RegexLexer, mismos tokens que
+# CompiscriptLexer en una fracción del tiempo), se ubican por anidamiento de llaves los
+# cuerpos de las funciones globales y de los métodos de clases globales, y se parsea un
+# esqueleto con esos cuerpos vacíos (mismas líneas y columnas). DeclarationChecker lo
+# recorre: declara funciones, clases, campos y firmas, chequea el resto de las sentencias
+# globales y, en vez de visitar cada cuerpo, anota un BodyJob con lo visible en ese punto.
+#
+# Fase 2 (workers): cada BodyJob se parsea por separado y se chequea solo su cuerpo, con
+# el ámbito global y la tabla de clases recortados a lo que había en su posición. Los
+# errores se intercalan en el orden del recorrido secuencial, así el resultado es el
+# mismo que el de CompilerSession.compile().
+#
+# Si el esqueleto o algún cuerpo tiene errores léxicos o sintácticos, o hay una clase
+# declarada dentro de un cuerpo (la tabla de clases es global), se usa compile() normal.
+
+_FUNCTION = CompiscriptLexer.literalNames.index("'function'")
+_CLASS = CompiscriptLexer.literalNames.index("'class'")
+_LBRACE = CompiscriptLexer.literalNames.index("'{'")
+_RBRACE = CompiscriptLexer.literalNames.index("'}'")
+
+
+@dataclass
+class BodyJob:
+    function: FunctionSymbol
+    cls: Optional[ClassSymbol]
+    n_globals: int      # símbolos globales visibles en este punto
+    n_classes: int      # entradas de la tabla de clases ya registradas
+    error_pos: int      # errores de la fase 1 reportados antes de este cuerpo
+    text: str = ""      # 'function ... { ... }' tal como está en la fuente
+    line: int = 1
+    col: int = 0
+
+
+class _ClassLog(dict):
+    """Tabla de clases que recuerda el orden de registro (para recortarla por posición)."""
+
+    def __init__(self):
+        super().__init__()
+        self.log = []
+
+    def __setitem__(self, name, cls_sym):
+        self.log.append((name, cls_sym))
+        super().__setitem__(name, cls_sym)
+
+
+class DeclarationChecker(SemanticChecker):
+    """Fase 1: chequea todo menos los cuerpos de funciones y métodos globales."""
+
+    def __init__(self, max_errors: Optional[int] = None):
+        super().__init__(max_errors)
+        self.class_table = _ClassLog()
+        self.jobs: List[BodyJob] = []
+
+    def _function_body(self, block):
+        if self.symbols.depth != 1:
+            return (yield block)
+        self.jobs.append(BodyJob(self.current_function, self.current_class, self.symbols.global_count,
+                                 len(self.class_table.log), len(self.errors)))
+        return None
+
+
+def _find_bodies(code: str):
+    """[(token 'function', '{', '}')] de cada cuerpo diferible, en orden de aparición;
+    None si hay errores léxicos, llaves sin cerrar o una clase dentro de un cuerpo."""
+    lexer = RegexLexer(InputStream(code))
+    listener = SyntaxErrorListener()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    tokens = lexer.getAllTokens()
+    if listener.has_errors:
+        return None
+
+    bodies = []
+    stack = []          # por cada '{' abierta: ("class" | "body" | "other", token, encabezado)
+    pending = None      # 'function' o 'class' cuyo '{' todavía no apareció
+    in_body = 0
+    for tok in tokens:
+        t = tok.type
+        if t == _FUNCTION:
+            if not stack or (len(stack) == 1 and stack[0][0] == "class"):
+                pending = tok
+        elif t == _CLASS:
+            if in_body:
+                return None
+            if not stack:
+                pending = tok
+        elif t == _LBRACE:
+            kind = "other"
+            if pending is not None:
+                kind = "body" if pending.type == _FUNCTION else "class"
+                in_body += kind == "body"
+            stack.append((kind, tok, pending))
+            pending = None
+        elif t == _RBRACE:
+            if not stack:
+                return None
+            kind, open_tok, header = stack.pop()
+            if kind == "body":
+                in_body -= 1
+                bodies.append((header, open_tok, tok))
+    return None if stack else bodies
+
+
+def _skeleton(code: str, bodies) -> str:
+    """La fuente con cada cuerpo vaciado, conservando líneas y la columna de la '}'."""
+    parts, pos = [], 0
+    for _, open_tok, close_tok in bodies:
+        inner = code[open_tok.stop + 1:close_tok.start]
+        newlines = inner.count("\n")
+        parts.append(code[pos:open_tok.stop + 1])
+        parts.append("\n" * newlines + " " * (len(inner) - inner.rfind("\n") - 1 if newlines else len(inner)))
+        pos = close_tok.start
+    parts.append(code[pos:])
+    return "".join(parts)
+
+
+class _BodyEnv:
+    """Fase 2: chequea cuerpos con el ámbito global de la fase 1 recortado a cada posición."""
+
+    def __init__(self, prediction: str, global_symbols: List[Symbol], class_log, max_errors: Optional[int],
+                 track_dependencies: bool = False):
+        self.session = CompilerSession(prediction)
+        self.global_symbols = global_symbols
+        self.class_log = class_log
+        # Un error de más por cuerpo: así merge_errors sabe si el total pasó de max_errors
+        self.max_errors = max_errors + 1 if max_errors else None
+        self.track_dependencies = track_dependencies
+        self.checker = None
+        self.n_globals = self.n_classes = 0
+
+    def _checker_at(self, job: BodyJob) -> SemanticChecker:
+        # Los cuerpos llegan casi siempre en orden: se agrega lo que falta y solo se
+        # rearma de cero si el job es de una posición anterior
+        if self.checker is None or self.n_globals > job.n_globals or self.n_classes > job.n_classes:
+            self.checker = SemanticChecker(self.max_errors, self.track_dependencies)
+            self.n_globals = self.n_classes = 0
+        c = self.checker
+        for sym in self.global_symbols[self.n_globals:job.n_globals]:
+            c.symbols.define(sym)
+        for name, cls_sym in self.class_log[self.n_classes:job.n_classes]:
+            c.class_table[name] = cls_sym
+        self.n_globals, self.n_classes = job.n_globals, job.n_classes
+        c.errors = []
+        if self.track_dependencies:
+            c.dependencies.clear()
+        return c
+
+    def check(self, job: BodyJob) -> Optional[List[Diagnostic]]:
+        """Errores del cuerpo, con posiciones relativas a job.text; None si no parsea."""
+        _, tree, syn = self.session.parse(InputStream(job.text))
+        statements = tree.statement() if tree is not None and not syn.has_errors else []
+        decl = statements[0].functionDeclaration() if len(statements) == 1 else None
+        if decl is None:
+            return None
+
+        c = self._checker_at(job)
+        c.symbols.push()
+        try:
+            if job.cls is not None:
+                c.symbols.define(VarSymbol(name="this", type=job.cls.type, initialized=True))
+            for p in job.function.params:
+                try:
+                    c.symbols.define(p)
+                except ValueError:
+                    pass  # ya reportado en la fase 1
+            c.current_function, c.current_class = job.function, job.cls
+            c.visit(decl.block())
+        except TooManyErrors:
+            pass
+        finally:
+            while c.symbols.depth:
+                c.symbols.pop()
+            c.current_function = c.current_class = None
+            c.loop_depth = 0
+            self.session._pipeline().release()
+        return c.errors
+
+
+def _shift(job: BodyJob, errors: List[Diagnostic]) -> List[Diagnostic]:
+    """Errores relativos a job.text -> posiciones en el archivo completo."""
+    line, col = job.line - 1, job.col
+    return [replace(d, line=d.line + line, col=d.col + col if d.line == 1 else d.col) for d in errors]
+
+
+# ---------- Workers del pool ----------
+_worker_env: Optional[_BodyEnv] = None
+
+
+def _init_worker(prediction, global_symbols, class_log, max_errors):
+    global _worker_env
+    dfacache.load()
+    _worker_env = _BodyEnv(prediction, global_symbols, class_log, max_errors)
+
+
+def _check_in_worker(job: BodyJob):
+    return _worker_env.check(job)
+
+
+def plan_bodies(session: CompilerSession, code: str):
+    """Fase 1 sobre el esqueleto de `code`. Devuelve (parser, checker, jobs), o None si hay
+    que usar compile() normal."""
+    bodies = _find_bodies(code)
+    if bodies is None:
+        return None
+    parser, tree, syn = session.parse(InputStream(_skeleton(code, bodies)))
+    if syn.has_errors:
+        return None
+    checker = DeclarationChecker(session.max_errors)
+    try:
+        checker.visit(tree)
+    except TooManyErrors:
+        pass
+    session._pipeline().release()
+    del tree
+
+    work = checker.jobs
+    if len(work) > len(bodies) or (len(work) < len(bodies) and not checker.truncated):
+        return None
+    for job, (header, _, close_tok) in zip(work, bodies):
+        job.text = code[header.start:close_tok.stop + 1]
+        job.line, job.col = header.line, header.column
+    return parser, checker, work
+
+
+def merge_errors(checker: DeclarationChecker, work: List[BodyJob], results: List[List[Diagnostic]],
+                 max_errors: Optional[int] = None) -> Tuple[List[Diagnostic], bool]:
+    """Intercala los errores de la fase 1 con los de cada cuerpo (relativos a job.text).
+    Devuelve (errores, truncated), recortados a max_errors como en compile()."""
+    errors, pos = [], 0
+    for job, body_errors in zip(work, results):
+        errors.extend(checker.errors[pos:job.error_pos])
+        errors.extend(_shift(job, body_errors))
+        pos = job.error_pos
+    errors.extend(checker.errors[pos:])
+    truncated = checker.truncated
+    if max_errors and len(errors) > max_errors:
+        del errors[max_errors:]
+        truncated = True
+    return errors, truncated
+
+
+def check_parallel(code: str, jobs: Optional[int] = None, prediction: str = PREDICTION_LL,
+                   max_errors: Optional[int] = None) -> CompileResult:
+    """Como CompilerSession(prediction, max_errors=...).compile_source(code), pero con los
+    cuerpos de funciones y métodos globales chequeados en `jobs` procesos. Sin árbol."""
+    session = CompilerSession(prediction, max_errors=max_errors)
+    planned = plan_bodies(session, code)
+    if planned is None:
+        return session.compile_source(code)
+    parser, checker, work = planned
+
+    args = (prediction, checker.symbols.global_symbols(), checker.class_table.log, max_errors)
+    jobs = min(jobs or os.cpu_count() or 1, len(work))
+    if jobs <= 1:
+        env = _BodyEnv(*args)
+        results = [env.check(job) for job in work]
+    else:
+        # Importado acá: incremental (--watch) usa este módulo sin pool
+        from concurrent.futures import ProcessPoolExecutor
+        chunksize = max(1, len(work) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=args) as pool:
+            results = list(pool.map(_check_in_worker, work, chunksize=chunksize))
+    if any(r is None for r in results):
+        return session.compile_source(code)
+    errors, truncated = merge_errors(checker, work, results, max_errors)
+    return CompileResult(tree=None, parser=parser, semantic_errors=errors, checker=checker, truncated=truncated)
@@ -0,0 +1,269 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+from antlr4 import CommonTokenStream, Token
+from antlr4.atn.ATNState import StarLoopEntryState
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.atn.Transition import AtomTransition, RuleTransition
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException, RecognitionException
+
+from CompiscriptParser import CompiscriptParser
+from .errors import SyntaxErrorListener
+from .lexer import LEXER_ANTLR, create_lexer
+from .tokens import ArrayTokenStream
+
+# Modos de predicción:
+#   "ll"        -> LL completo (comportamiento por defecto de ANTLR)
+#   "two-stage" -> SLL + BailErrorStrategy; solo si SLL falla se re-parsea con LL
+PREDICTION_LL = "ll"
+PREDICTION_TWO_STAGE = "two-stage"
+PREDICTION_MODES = (PREDICTION_LL, PREDICTION_TWO_STAGE)
+
+# El parser generado es recursivo: cada nivel de paréntesis son ~15 frames. Desde 3.11
+# las llamadas Python -> Python no consumen pila de C, así que basta con subir el límite
+# para aceptar ~10k niveles de anidamiento. En 3.10 un límite así desbordaría la pila de
+# C (el proceso cae en vez de lanzar RecursionError), así que ahí se deja el de siempre.
+PARSER_RECURSION_LIMIT = 200_000
+_DEEP_NESTING = sys.version_info >= (3, 11)
+
+
+def _program_states():
+    """Estados ATN que CompiscriptParser.program() asigna a parser.state (inicio del bucle,
+    llamada a statement, fin de iteración y EOF), sacados del ATN para que sigan valiendo
+    si se regenera el parser. Si 'program' deja de ser `statement* EOF`, falla al importar
+    en vez de romper la recuperación de errores de iter_program."""
+    atn = CompiscriptParser.atn
+    loop = atn.ruleToStartState[CompiscriptParser.RULE_program].transitions[0].target
+    if not isinstance(loop, StarLoopEntryState):
+        raise RuntimeError("la regla 'program' ya no empieza con statement*: revisar iter_program")
+    call = loop.transitions[0].target.transitions[0].target
+    loop_end = loop.transitions[1].target
+    eof = loop_end.transitions[0].target
+    call_rule = call.transitions[0] if len(call.transitions) == 1 else None
+    eof_match = eof.transitions[0] if len(eof.transitions) == 1 else None
+    if (not isinstance(call_rule, RuleTransition) or call_rule.target.ruleIndex != CompiscriptParser.RULE_statement
+            or not isinstance(eof_match, AtomTransition) or eof_match.label_ != Token.EOF):
+        raise RuntimeError("la regla 'program' ya no es `statement* EOF`: revisar iter_program")
+    return loop.stateNumber, call.stateNumber, loop.loopBackState.stateNumber, eof.stateNumber
+
+
+_PROGRAM_LOOP, _PROGRAM_STATEMENT, _PROGRAM_NEXT, _PROGRAM_EOF = _program_states()
+_STATEMENT_FIRST = frozenset(
+    CompiscriptParser.atn.nextTokens(CompiscriptParser.atn.ruleToStartState[CompiscriptParser.RULE_statement]))
+
+
+class _LLFailed(ParseCancellationException):
+    """El reintento LL de una sentencia también falló: hay un error sintáctico real."""
+
+
+class TwoStageParser(CompiscriptParser):
+    """CompiscriptParser que, en modo SLL, reintenta con LL solo la sentencia que falló.
+
+    La gramática es ambigua en `obj.campo = expr;` (assignment vs expressionStatement),
+    así que SLL falla en cualquier archivo con asignaciones a propiedades. En vez de
+    re-parsear todo el archivo, se deshace la sentencia más interna y se repite con LL
+    usando el mismo contexto de invocación; si LL también falla, el error es real y
+    parse_program cae al LL completo con recuperación normal.
+    """
+
+    def statement(self):
+        interp = self._interp
+        if interp.predictionMode != PredictionMode.SLL:
+            return super().statement()
+
+        parent = self._ctx
+        start = self._input.index
+        syntax_errors = self._syntaxErrors
+        try:
+            return super().statement()
+        except _LLFailed:
+            raise
+        except ParseCancellationException:
+            pass
+
+        _undo_statement(self, parent, start, syntax_errors)
+        interp.predictionMode = PredictionMode.LL
+        try:
+            return super().statement()
+        except ParseCancellationException as e:
+            raise _LLFailed(e) from None
+        finally:
+            interp.predictionMode = PredictionMode.SLL
+
+
+_nesting_lock = threading.Lock()
+_nesting_depth = 0          # bloques deep_nesting() activos, en cualquier hilo
+_saved_limit = None
+
+
+@contextmanager
+def deep_nesting(limit: int = PARSER_RECURSION_LIMIT):
+    """Sube el límite de recursión mientras dura el bloque (solo desde 3.11). El límite es
+    global del intérprete: se restaura cuando sale el último bloque activo, así un hilo
+    no se lo baja a otro que sigue parseando."""
+    global _nesting_depth, _saved_limit
+    if not _DEEP_NESTING:
+        yield
+        return
+    with _nesting_lock:
+        if _nesting_depth == 0:
+            _saved_limit = sys.getrecursionlimit()
+            if _saved_limit < limit:
+                sys.setrecursionlimit(limit)
+        _nesting_depth += 1
+    try:
+        yield
+    finally:
+        with _nesting_lock:
+            _nesting_depth -= 1
+            if _nesting_depth == 0:
+                sys.setrecursionlimit(_saved_limit)
+
+
+def _undo_statement(parser, parent, start, syntax_errors):
+    """Deshace un intento fallido de 'statement': hijo parcial, excepciones marcadas y
+    estado de error; deja el token stream al inicio de la sentencia."""
+    if parent is not None:
+        if parser.buildParseTrees:
+            parent.removeLastChild()
+        ctx = parent
+        while ctx is not None:
+            ctx.exception = None
+            ctx = ctx.parentCtx
+    parser._errHandler.reset(parser)
+    parser._syntaxErrors = syntax_errors
+    parser._input.seek(start)
+
+
+def create_parser(token_stream, prediction=PREDICTION_LL):
+    if prediction == PREDICTION_LL:
+        return CompiscriptParser(token_stream)
+    if prediction == PREDICTION_TWO_STAGE:
+        return TwoStageParser(token_stream)
+    raise ValueError(f"Modo de predicción desconocido: {prediction}")
+
+
+def parse_program(parser, prediction=PREDICTION_LL):
+    """Ejecuta la regla 'program' sobre un parser ya configurado con sus listeners."""
+    if prediction == PREDICTION_LL:
+        return parser.program()
+    if prediction != PREDICTION_TWO_STAGE:
+        raise ValueError(f"Modo de predicción desconocido: {prediction}")
+
+    # Etapa 1: SLL sin recuperación ni reporte de errores
+    listeners = parser._listeners
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    try:
+        return parser.program()
+    except ParseCancellationException:
+        pass
+    finally:
+        parser._listeners = listeners
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+
+    # Etapa 2: LL completo desde el primer token (los tokens ya están en buffer),
+    # con la recuperación de errores por defecto para obtener los mismos diagnósticos
+    parser.reset()
+    return parser.program()
+
+
+def iter_program(parser, prediction=PREDICTION_LL):
+    """Igual que parse_program, pero entrega cada sentencia de nivel superior apenas se
+    parsea, sin acumularla en el ProgramContext, y suelta del buffer los tokens ya
+    consumidos. Así la memoria no crece con el tamaño del archivo.
+
+    En modo dos etapas no se puede re-parsear desde el inicio: ante un error real se
+    rehace solo la sentencia actual con LL y recuperación normal, y el resto del archivo
+    sigue así (las sentencias anteriores ya habían parseado sin errores).
+    """
+    if prediction not in PREDICTION_MODES:
+        raise ValueError(f"Modo de predicción desconocido: {prediction}")
+    sll = prediction == PREDICTION_TWO_STAGE
+    listeners = parser._listeners
+    if sll:
+        parser.removeErrorListeners()
+        parser._errHandler = BailErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.SLL
+
+    def fallback():
+        nonlocal sll
+        sll = False
+        parser._listeners = listeners
+        parser._errHandler = DefaultErrorStrategy()
+        parser._interp.predictionMode = PredictionMode.LL
+
+    tokens = parser._input
+    trimmed = 0
+    ctx = CompiscriptParser.ProgramContext(parser, parser._ctx, parser.state)
+    parser.enterRule(ctx, 0, CompiscriptParser.RULE_program)
+    try:
+        parser.enterOuterAlt(ctx, 1)
+        parser.state = _PROGRAM_LOOP
+        while True:
+            parser._errHandler.sync(parser)
+            la = tokens.LA(1)
+            if la not in _STATEMENT_FIRST:
+                if sll and la != Token.EOF:
+                    fallback()  # repetir el sync con recuperación de errores
+                    continue
+                break
+
+            start = tokens.index
+            syntax_errors = parser._syntaxErrors
+            parser.state = _PROGRAM_STATEMENT
+            try:
+                st = parser.statement()
+            except ParseCancellationException:
+                if not sll:
+                    raise
+                _undo_statement(parser, ctx, start, syntax_errors)
+                fallback()
+                parser.state = _PROGRAM_STATEMENT
+                st = parser.statement()
+            if parser.buildParseTrees:
+                ctx.removeLastChild()
+            yield st
+            del st
+
+            # Tokens ya consumidos; se conserva el último para LT(-1)
+            end = tokens.index - 1
+            if isinstance(tokens, ArrayTokenStream):
+                tokens.discard(end)
+            else:
+                buffer = tokens.tokens
+                for i in range(trimmed, end):
+                    buffer[i] = None
+                trimmed = max(trimmed, end)
+            parser.state = _PROGRAM_NEXT
+
+        parser.state = _PROGRAM_EOF
+        parser.match(Token.EOF)
+    except RecognitionException as re:
+        ctx.exception = re
+        parser._errHandler.reportError(parser, re)
+        parser._errHandler.recover(parser, re)
+    finally:
+        parser.exitRule()
+        if sll:
+            fallback()
+
+
+def parse(input_stream, prediction=PREDICTION_LL, lexer=LEXER_ANTLR):
+    """Lexer + parser sobre input_stream. Devuelve (parser, tree, syntax_listener)."""
+    lexer = create_lexer(lexer, input_stream)
+    tokens = CommonTokenStream(lexer)
+    parser = create_parser(tokens, prediction)
+
+    syntax_listener = SyntaxErrorListener()
+    for recognizer in (lexer, parser):
+        recognizer.removeErrorListeners()
+        recognizer.addErrorListener(syntax_listener)
+
+    with deep_nesting():
+        tree = parse_program(parser, prediction)
+    return parser, tree, syntax_listener
@@ -0,0 +1,87 @@
+import hashlib, json, os, tempfile
+from typing import List, Optional, Tuple
+
+from .cachedir import cache_dir, checker_version, grammar_hash
+
+# Caché en disco de diagnósticos por contenido: clave = sha256(grammar + checker +
+# opciones + fuente). Cada entrada es un JSON pequeño en results/<2 hex>/<resto>.json;
+# la fecha de modificación hace de marca LRU (se actualiza en cada acierto) y prune()
+# borra las entradas más antiguas cuando el directorio supera max_bytes.
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ResultCache:
+    def __init__(self, directory: str = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or os.path.join(cache_dir(), "results")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._salt = (grammar_hash() + checker_version()).encode("ascii")
+
+    def key(self, source: bytes, options: str = "") -> str:
+        h = hashlib.sha256(self._salt)
+        h.update(options.encode("utf-8"))
+        h.update(b"\0")
+        h.update(source)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:] + ".json")
+
+    def get(self, key: str) -> Optional[Tuple[List[str], List[str], bool]]:
+        """Devuelve (syntax_errors, semantic_errors, truncated) o None si no está en caché."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            result = data["syntax"], data["semantic"], bool(data.get("truncated", False))
+            os.utime(path)  # marca LRU
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(self, key: str, syntax_errors: List[str], semantic_errors: List[str], truncated: bool = False):
+        path = self._path(key)
+        directory = os.path.dirname(path)
+        tmp = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"syntax": syntax_errors, "semantic": semantic_errors, "truncated": truncated}, f,
+                          ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            if tmp is not None and os.path.exists(tmp):
+                os.unlink(tmp)
+
+    def prune(self) -> int:
+        """Aplica el límite de tamaño borrando por LRU hasta el 90 %. Devuelve cuántas borró."""
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total <= self.max_bytes:
+            return 0
+        removed = 0
+        target = self.max_bytes * 0.9
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
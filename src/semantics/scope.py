@@ -1,21 +1,85 @@
-from dataclasses import dataclass, field
-from typing import Optional, Dict
+from typing import Dict, List, Optional, Tuple
 from .symbols import Symbol
 
-@dataclass
-class Scope:
-    parent: Optional['Scope'] = None
-    symbols: Dict[str, Symbol] = field(default_factory=dict)
+# Tabla de símbolos plana.
+#
+# En vez de una cadena de ámbitos (cada uno con su dict) hay un solo dict
+# nombre -> pila de (nivel, símbolo): el tope de la pila es la declaración visible,
+# así que resolve() es una sola búsqueda sin importar la profundidad. Cada define()
+# anota el nombre en un log de deshacer; push() marca la longitud del log y pop()
+# desapila los nombres definidos desde esa marca.
+class SymbolTable:
+    def __init__(self):
+        self._bindings: Dict[str, List[Tuple[int, Symbol]]] = {}
+        self._log: List[str] = []
+        self._marks: List[int] = []
+
+    @property
+    def depth(self) -> int:
+        """0 en el ámbito global."""
+        return len(self._marks)
+
+    def push(self):
+        self._marks.append(len(self._log))
+
+    def pop(self):
+        bindings, log = self._bindings, self._log
+        mark = self._marks.pop()
+        while len(log) > mark:
+            name = log.pop()
+            stack = bindings[name]
+            stack.pop()
+            if not stack:
+                del bindings[name]
+
+    @property
+    def global_count(self) -> int:
+        """Cantidad de símbolos definidos en el ámbito global."""
+        return self._marks[0] if self._marks else len(self._log)
+
+    def global_symbols(self) -> List[Symbol]:
+        """Símbolos del ámbito global, en orden de definición."""
+        bindings = self._bindings
+        return [bindings[name][0][1] for name in self._log[:self.global_count]]
 
     def define(self, sym: Symbol):
-        if sym.name in self.symbols:
+        depth = len(self._marks)
+        stack = self._bindings.get(sym.name)
+        if stack is None:
+            self._bindings[sym.name] = [(depth, sym)]
+        elif stack[-1][0] == depth:
             raise ValueError(f"Redeclaración en el mismo ámbito: {sym.name}")
-        self.symbols[sym.name] = sym
+        else:
+            stack.append((depth, sym))
+        self._log.append(sym.name)
 
     def resolve(self, name: str) -> Optional[Symbol]:
-        cur = self
-        while cur:
-            if name in cur.symbols:
-                return cur.symbols[name]
-            cur = cur.parent
-        return None
+        stack = self._bindings.get(name)
+        return stack[-1][1] if stack else None
+
+    def __iter__(self):
+        """Símbolos visibles desde el ámbito actual."""
+        for stack in self._bindings.values():
+            yield stack[-1][1]
+
+
+# Para el chequeo incremental: anotan cada nombre buscado (esté declarado o no), porque
+# el resultado de un chequeo depende de a qué resolvió cada uno.
+class RecordingSymbolTable(SymbolTable):
+    def __init__(self):
+        super().__init__()
+        self.used = set()
+
+    def resolve(self, name: str) -> Optional[Symbol]:
+        self.used.add(name)
+        return super().resolve(name)
+
+
+class RecordingClassTable(dict):
+    def __init__(self, used: set):
+        super().__init__()
+        self.used = used
+
+    def get(self, name, default=None):
+        self.used.add(name)
+        return super().get(name, default)
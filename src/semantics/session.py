@@ -0,0 +1,191 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+from antlr4 import CommonTokenStream, InputStream
+
+from .checker import SemanticChecker
+from .errors import Diagnostic, SyntaxErrorListener, TooManyErrors
+from .lexer import LEXER_ANTLR, create_lexer
+from .mmapstream import open_stream
+from .tokens import ArrayTokenStream
+from .parsing import PREDICTION_LL, create_parser, deep_nesting, iter_program, parse_program
+
+
+@dataclass
+class CompileResult:
+    tree: Any
+    parser: Any
+    syntax_errors: List[Diagnostic] = field(default_factory=list)
+    semantic_errors: List[Diagnostic] = field(default_factory=list)
+    checker: Optional[SemanticChecker] = None
+    truncated: bool = False  # el análisis se cortó en max_errors y había más errores
+
+    @property
+    def ok(self) -> bool:
+        return not self.syntax_errors and not self.semantic_errors
+
+    @property
+    def errors(self) -> List[Diagnostic]:
+        return self.syntax_errors or self.semantic_errors
+
+
+class _Pipeline:
+    """Lexer, token stream y parser de un hilo; se reutilizan entre archivos."""
+
+    def __init__(self, prediction, lexer=LEXER_ANTLR, compact_tokens=False):
+        self.lexer = create_lexer(lexer)
+        self.tokens = ArrayTokenStream(self.lexer) if compact_tokens else CommonTokenStream(self.lexer)
+        self.parser = create_parser(self.tokens, prediction)
+
+    def reset(self, input_stream):
+        self.lexer.inputStream = input_stream
+        self.tokens.setTokenSource(self.lexer)
+        self.parser.setTokenStream(self.tokens)
+
+    def release(self):
+        """Suelta la entrada y los tokens del último archivo (el árbol ya no los necesita)."""
+        self.lexer.inputStream = None
+        self.tokens.setTokenSource(self.lexer)
+        # El simulador guarda el contexto de la última predicción, y con él todo el árbol
+        self.parser._interp._outerContext = None
+
+
+class CompilerSession:
+    """Sesión de compilación reutilizable.
+
+    Mantiene un lexer y un parser por hilo y los reinicia en cada archivo en lugar
+    de construirlos de nuevo. Las tablas DFA y el PredictionContextCache son
+    atributos de clase de CompiscriptLexer/CompiscriptParser, así que todas las
+    compilaciones del proceso comparten las predicciones ya aprendidas.
+
+    Con stream=True, compile() chequea cada sentencia de nivel superior apenas se
+    parsea y la descarta; con syntax_only=True solo parsea, sin construir el árbol
+    ni correr el checker. En ambos casos el resultado no trae árbol (tree=None).
+
+    Con max_errors, el parseo o el chequeo se detienen al encontrar un error más allá
+    de esa cantidad (sintácticos o semánticos) y el resultado queda con truncated=True. Con side_tables=True, compile() deja en
+    result.checker el tipo de cada expresión y el símbolo de cada identificador
+    (checker.type_of / checker.symbol_of); no aplica en modo streaming, que no conserva
+    el árbol.
+
+    lexer elige entre CompiscriptLexer ("antlr") y semantics.lexer.RegexLexer ("regex");
+    producen los mismos tokens y errores. Con compact_tokens=True los tokens se guardan en
+    columnas (semantics.tokens.ArrayTokenStream) en vez de un CommonToken por token.
+    """
+
+    def __init__(self, prediction: str = PREDICTION_LL, stream: bool = False, syntax_only: bool = False,
+                 max_errors: Optional[int] = None, side_tables: bool = False, lexer: str = LEXER_ANTLR,
+                 compact_tokens: bool = False):
+        self.prediction = prediction
+        self.stream = stream
+        self.syntax_only = syntax_only
+        self.max_errors = max_errors or None
+        self.side_tables = side_tables
+        self.lexer = lexer
+        self.compact_tokens = compact_tokens
+        self._local = threading.local()
+
+    def _pipeline(self) -> _Pipeline:
+        pipeline = getattr(self._local, "pipeline", None)
+        if pipeline is None:
+            pipeline = self._local.pipeline = _Pipeline(self.prediction, self.lexer, self.compact_tokens)
+        return pipeline
+
+    @property
+    def cache_options(self) -> str:
+        """Opciones que cambian los diagnósticos; van en la clave de la caché de resultados."""
+        options = []
+        if self.syntax_only:
+            options.append("syntax-only")
+        if self.max_errors:
+            options.append(f"max-errors={self.max_errors}")
+        return ";".join(options)
+
+    def _prepare(self, input_stream):
+        pipeline = self._pipeline()
+        pipeline.reset(input_stream)
+        parser = pipeline.parser
+
+        # Los errores léxicos ('token recognition error') van al mismo listener que los del
+        # parser: cuentan para max_errors y se guardan en la caché de resultados
+        syntax_listener = SyntaxErrorListener(self.max_errors)
+        for recognizer in (pipeline.lexer, parser):
+            recognizer.removeErrorListeners()
+            recognizer.addErrorListener(syntax_listener)
+        return parser, syntax_listener
+
+    def parse(self, input_stream):
+        """Devuelve (parser, tree, syntax_listener), igual que parsing.parse."""
+        parser, syntax_listener = self._prepare(input_stream)
+        try:
+            with deep_nesting():
+                tree = parse_program(parser, self.prediction)
+        except TooManyErrors:
+            tree = None
+        return parser, tree, syntax_listener
+
+    def check_syntax(self, input_stream) -> List[Diagnostic]:
+        """Solo análisis sintáctico, con buildParseTrees=False. Devuelve los errores."""
+        return self._check_syntax(input_stream).errors
+
+    def _check_syntax(self, input_stream) -> SyntaxErrorListener:
+        parser, syn = self._prepare(input_stream)
+        parser.buildParseTrees = False
+        try:
+            with deep_nesting():
+                for _ in iter_program(parser, self.prediction):
+                    pass
+        except TooManyErrors:
+            pass
+        finally:
+            parser.buildParseTrees = True
+            self._pipeline().release()
+        return syn
+
+    def compile(self, input_stream) -> CompileResult:
+        if self.syntax_only:
+            syn = self._check_syntax(input_stream)
+            return CompileResult(tree=None, parser=self._pipeline().parser, syntax_errors=syn.errors,
+                                 truncated=syn.truncated)
+        if self.stream:
+            return self.compile_streaming(input_stream)
+        parser, tree, syn = self.parse(input_stream)
+        if syn.has_errors:
+            return CompileResult(tree=tree, parser=parser, syntax_errors=syn.errors, truncated=syn.truncated)
+
+        checker = SemanticChecker(self.max_errors, side_tables=self.side_tables)
+        try:
+            checker.visit(tree)
+        except TooManyErrors:
+            pass
+        return CompileResult(tree=tree, parser=parser, semantic_errors=checker.errors, checker=checker,
+                             truncated=checker.truncated)
+
+    def compile_streaming(self, input_stream) -> CompileResult:
+        """Parseo y chequeo sentencia por sentencia contra el mismo ámbito global. Tras el
+        primer error sintáctico solo se sigue parseando, y como en compile() se reportan
+        únicamente los errores sintácticos."""
+        parser, syn = self._prepare(input_stream)
+        checker = SemanticChecker(self.max_errors)
+        statements = iter_program(parser, self.prediction)
+        try:
+            with deep_nesting():
+                for st in statements:
+                    if not syn.has_errors:
+                        checker.visit(st)
+        except TooManyErrors:
+            pass
+        finally:
+            statements.close()  # si cortó el checker, el generador sigue abierto
+            self._pipeline().release()
+        if syn.has_errors:
+            return CompileResult(tree=None, parser=parser, syntax_errors=syn.errors, truncated=syn.truncated)
+        return CompileResult(tree=None, parser=parser, semantic_errors=checker.errors, checker=checker,
+                             truncated=checker.truncated)
+
+    def compile_source(self, code: str) -> CompileResult:
+        return self.compile(InputStream(code))
+
+    def compile_file(self, filename: str) -> CompileResult:
+        return self.compile(open_stream(filename))
@@ -2,25 +2,27 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from .types import Type
 
-@dataclass
+# Con slots: sin __dict__ por instancia (un servicio puede tener las tablas de muchos
+# archivos en memoria a la vez).
+@dataclass(slots=True)
 class Symbol:
     name: str
     type: Type
 
-@dataclass
+@dataclass(slots=True)
 class VarSymbol(Symbol):
     is_const: bool = False
     initialized: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class ParamSymbol(Symbol):
     pass
 
-@dataclass
+@dataclass(slots=True)
 class FunctionSymbol(Symbol):
     params: List[ParamSymbol] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class ClassSymbol(Symbol):
     fields: Dict[str, Symbol] = field(default_factory=dict)
     methods: Dict[str, FunctionSymbol] = field(default_factory=dict)
@@ -0,0 +1,267 @@
+from array import array
+
+from antlr4 import Token
+from antlr4.BufferedTokenStream import TokenStream
+from antlr4.error.Errors import IllegalStateException
+
+# Token stream compacto (struct of arrays).
+#
+# CommonTokenStream guarda un CommonToken por token: ~9 slots más los int de start/stop,
+# línea y columna, unos 150-200 bytes cada uno. ArrayTokenStream guarda tipo, start/stop,
+# línea y columna en columnas array('i') (20 bytes por token) y arma un TokenView (el
+# índice del token y una referencia a las columnas) solo cuando el parser o un mensaje de
+# error piden el token; el parser predice mirando LA(), que lee directo de la columna.
+#
+# Compiscript no tiene tokens fuera del canal por defecto (WS y comentarios son skip), así
+# que LT(k) es simplemente el token index + k - 1, igual que en CommonTokenStream.
+
+
+class TokenColumns:
+    """Columnas de los tokens de un archivo; las vistas las mantienen vivas con el árbol."""
+
+    __slots__ = ("types", "starts", "stops", "lines", "columns", "source", "offset")
+
+    def __init__(self, source):
+        self.types = array("i")
+        self.starts = array("i")
+        self.stops = array("i")
+        self.lines = array("i")
+        self.columns = array("i")
+        self.source = source    # (lexer, input stream), como CommonToken.source
+        self.offset = 0         # tokens descartados al inicio (ArrayTokenStream.discard)
+
+    def __len__(self):
+        return self.offset + len(self.types)
+
+    def row(self, i: int) -> int:
+        row = i - self.offset
+        if row < 0:
+            raise IndexError(f"token {i} ya descartado del buffer")
+        return row
+
+
+class TokenView:
+    """Token de un ArrayTokenStream: guarda solo su índice y lee los campos de las columnas."""
+
+    __slots__ = ("_columns", "tokenIndex")
+
+    channel = Token.DEFAULT_CHANNEL
+
+    def __init__(self, columns: TokenColumns, index: int):
+        self._columns = columns
+        self.tokenIndex = index
+
+    @property
+    def type(self):
+        c = self._columns
+        return c.types[c.row(self.tokenIndex)]
+
+    @property
+    def start(self):
+        c = self._columns
+        return c.starts[c.row(self.tokenIndex)]
+
+    @property
+    def stop(self):
+        c = self._columns
+        return c.stops[c.row(self.tokenIndex)]
+
+    @property
+    def line(self):
+        c = self._columns
+        return c.lines[c.row(self.tokenIndex)]
+
+    @property
+    def column(self):
+        c = self._columns
+        return c.columns[c.row(self.tokenIndex)]
+
+    @property
+    def text(self):
+        c = self._columns
+        row = c.row(self.tokenIndex)
+        if c.types[row] == Token.EOF:
+            return "<EOF>"
+        return c.source[1].getText(c.starts[row], c.stops[row])
+
+    @property
+    def source(self):
+        return self._columns.source
+
+    def getTokenSource(self):
+        return self._columns.source[0]
+
+    def getInputStream(self):
+        return self._columns.source[1]
+
+    def __str__(self):
+        text = self.text.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t")
+        return (f"[@{self.tokenIndex},{self.start}:{self.stop}='{text}',<{self.type}>,"
+                f"{self.line}:{self.column}]")
+
+
+class ArrayTokenStream(TokenStream):
+    """Reemplazo de CommonTokenStream con los tokens en columnas (ver TokenColumns).
+
+    Si la fuente es un RegexLexer, los campos pasan del lexer a las columnas sin crear
+    objetos token; con otro lexer se copian de cada CommonToken y este se descarta."""
+
+    _VIEW_CACHE = 16   # vistas recientes reutilizadas (ctx.start/stop de reglas anidadas)
+
+    def __init__(self, tokenSource):
+        self.setTokenSource(tokenSource)
+
+    def setTokenSource(self, tokenSource):
+        self.tokenSource = tokenSource
+        self._columns = None
+        self._views = {}
+        self.index = -1
+        self.fetchedEOF = False
+
+    @property
+    def columns(self) -> TokenColumns:
+        if self._columns is None:
+            source = self.tokenSource
+            self._columns = TokenColumns((source, source.inputStream))
+            self._next_fields = getattr(source, "next_fields", None)
+        return self._columns
+
+    def fetch(self, n: int) -> int:
+        if self.fetchedEOF:
+            return 0
+        c = self.columns
+        types, starts, stops, lines, columns = c.types, c.starts, c.stops, c.lines, c.columns
+        next_fields = self._next_fields
+        for i in range(n):
+            if next_fields is not None:
+                ttype, start, stop, line, column = next_fields()
+            else:
+                t = self.tokenSource.nextToken()
+                if t.channel != Token.DEFAULT_CHANNEL:
+                    raise ValueError("ArrayTokenStream no admite tokens fuera del canal por defecto")
+                ttype, start, stop, line, column = t.type, t.start, t.stop, t.line, t.column
+            types.append(ttype)
+            starts.append(start)
+            stops.append(stop)
+            lines.append(line)
+            columns.append(column)
+            if ttype == Token.EOF:
+                self.fetchedEOF = True
+                return i + 1
+        return n
+
+    def sync(self, i: int) -> bool:
+        n = i - len(self.columns) + 1
+        if n > 0:
+            return self.fetch(n) >= n
+        return True
+
+    def fill(self):
+        self.lazyInit()
+        while self.fetch(1000) == 1000:
+            pass
+
+    def lazyInit(self):
+        if self.index == -1:
+            self.sync(0)
+            self.index = 0
+
+    def _view(self, i: int) -> TokenView:
+        view = self._views.get(i)
+        if view is None:
+            if len(self._views) >= self._VIEW_CACHE:
+                self._views.clear()
+            view = self._views[i] = TokenView(self.columns, i)
+        return view
+
+    def get(self, i: int) -> TokenView:
+        self.lazyInit()
+        return self._view(i)
+
+    def LA(self, k: int) -> int:
+        c = self._columns
+        if k > 0 and c is not None:
+            row = self.index + k - 1 - c.offset
+            if 0 <= row < len(c.types):
+                return c.types[row]
+        self.lazyInit()
+        c = self._columns
+        if k < 0:
+            i = self.index + k
+            return c.types[c.row(i)] if i >= 0 else None
+        i = self.index + k - 1
+        self.sync(i)
+        n = len(c)
+        return c.types[c.row(i if i < n else n - 1)]
+
+    def LT(self, k: int):
+        if k == 1 and self.index >= 0:
+            view = self._views.get(self.index)
+            if view is not None:
+                return view
+        self.lazyInit()
+        if k == 0:
+            return None
+        if k < 0:
+            return self.LB(-k)
+        i = self.index + k - 1
+        self.sync(i)
+        n = len(self._columns)
+        return self._view(i if i < n else n - 1)
+
+    def LB(self, k: int):
+        i = self.index - k
+        return self._view(i) if i >= 0 else None
+
+    def consume(self):
+        n = len(self.columns)
+        skip_eof_check = self.index >= 0 and self.index < (n - 1 if self.fetchedEOF else n)
+        if not skip_eof_check and self.LA(1) == Token.EOF:
+            raise IllegalStateException("cannot consume EOF")
+        if self.sync(self.index + 1):
+            self.index = min(self.index + 1, len(self._columns) - 1)
+
+    def seek(self, index: int):
+        self.lazyInit()
+        self.sync(index)
+        self.index = min(index, len(self._columns) - 1)
+
+    def reset(self):
+        self.seek(0)
+
+    def mark(self):
+        return 0
+
+    def release(self, marker: int):
+        pass
+
+    def discard(self, stop: int):
+        """Suelta las filas de los tokens anteriores a `stop` (modo streaming). Compacta solo
+        cuando lo descartado es al menos la mitad del buffer, así el costo es amortizado."""
+        c = self.columns
+        k = stop - c.offset
+        if k > 0 and 2 * k >= len(c.types):
+            for column in (c.types, c.starts, c.stops, c.lines, c.columns):
+                del column[:k]
+            c.offset = stop
+            self._views.clear()
+
+    def getText(self, start=None, stop=None) -> str:
+        self.lazyInit()
+        self.fill()
+        n = len(self._columns)
+        start = 0 if start is None else start if isinstance(start, int) else start.tokenIndex
+        stop = n - 1 if stop is None else stop if isinstance(stop, int) else stop.tokenIndex
+        stop = min(stop, n - 1)
+        if start < 0 or stop < 0 or stop < start:
+            return ""
+        parts = []
+        for i in range(start, stop + 1):
+            view = TokenView(self._columns, i)
+            if view.type == Token.EOF:
+                break
+            parts.append(view.text)
+        return "".join(parts)
+
+    def getSourceName(self):
+        return self.tokenSource.getSourceName()
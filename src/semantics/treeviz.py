@@ -1,32 +1,36 @@
 from graphviz import Digraph
 from antlr4 import ParserRuleContext, TerminalNode
 
-def _label(node, rule_names):
+def _label(node, rule_names, checker=None):
     if isinstance(node, TerminalNode):
         sym = node.getSymbol()
-        return f"'{sym.text}'"
+        label = f"'{sym.text}'"
     elif isinstance(node, ParserRuleContext):
         idx = node.getRuleIndex()
-        return rule_names[idx]
-    return type(node).__name__
+        label = rule_names[idx]
+    else:
+        return type(node).__name__
+    # Con las tablas laterales del checker (side_tables=True) se muestra el tipo
+    t = checker.type_of(node) if checker is not None else None
+    return f"{label}\n: {t}" if t is not None else label
 
-def _walk(dot, node, rule_names, idx_gen):
+def _walk(dot, node, rule_names, idx_gen, checker=None):
     my_id = next(idx_gen)
-    dot.node(str(my_id), _label(node, rule_names))
+    dot.node(str(my_id), _label(node, rule_names, checker))
 
     # children
     for i in range(0, node.getChildCount()):
         child = node.getChild(i)
-        child_id = _walk(dot, child, rule_names, idx_gen)
+        child_id = _walk(dot, child, rule_names, idx_gen, checker)
         dot.edge(str(my_id), str(child_id))
     return my_id
 
-def render_parse_tree_svg(tree, rule_names):
+def render_parse_tree_svg(tree, rule_names, checker=None):
     dot = Digraph(comment="ParseTree", format="svg")
     def counter():
         i = 0
         while True:
             yield i
             i += 1
-    _walk(dot, tree, rule_names, counter())
+    _walk(dot, tree, rule_names, counter(), checker)
     return dot.pipe().decode("utf-8")
@@ -1,34 +1,96 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
+from weakref import WeakValueDictionary
 
 # Tipos
+#
+# Todos los tipos están internados: IntegerType() siempre devuelve la misma instancia,
+# y ArrayType(INT) o ClassType("Punto") devuelven el mismo objeto para el mismo
+# elemento / nombre. Como la compatibilidad del lenguaje es igualdad estructural, dos
+# tipos son compatibles sii son el mismo objeto, y se pueden usar como claves de dict
+# (hash por identidad).
+#
+# Las tablas de ArrayType y ClassType tienen valores débiles: un proceso largo (el IDE)
+# no acumula los tipos de programas ya descartados. Mientras alguien tenga un tipo, pedirlo
+# de nuevo devuelve ese mismo objeto; si nadie lo tiene, nadie puede compararlo con uno nuevo.
 class Type:
+    __slots__ = ()
+    _instances: Dict[type, 'Type'] = {}
+
+    def __new__(cls):
+        inst = Type._instances.get(cls)
+        if inst is None:
+            inst = Type._instances.setdefault(cls, super().__new__(cls))
+        return inst
+
+    def __reduce__(self):
+        return (type(self), ())
+
     def is_compatible(self, other: 'Type') -> bool:
-        return isinstance(other, type(self))
+        return other is self
 
     def __str__(self):
         return self.__class__.__name__.replace('Type','').lower()
 
-class IntegerType(Type): pass
-class FloatType(Type): pass
-class StringType(Type): pass
-class BooleanType(Type): pass
-class NullType(Type): pass
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+class IntegerType(Type): __slots__ = ()
+class FloatType(Type): __slots__ = ()
+class StringType(Type): __slots__ = ()
+class BooleanType(Type): __slots__ = ()
+class NullType(Type): __slots__ = ()
 
-@dataclass
 class ArrayType(Type):
-    elem: Type
-    def is_compatible(self, other: 'Type') -> bool:
-        return isinstance(other, ArrayType) and self.elem.is_compatible(other.elem)
-    def __str__(self): return f"{self.elem}[]"
+    __slots__ = ("elem", "__weakref__")
+    _interned: 'WeakValueDictionary[Type, ArrayType]' = WeakValueDictionary()
+
+    def __new__(cls, elem: Type):
+        t = cls._interned.get(elem)
+        if t is None:
+            t = object.__new__(cls)
+            t.elem = elem
+            t = cls._interned.setdefault(elem, t)
+        return t
+
+    def __reduce__(self):
+        return (ArrayType, (self.elem,))
+
+    # Iterativos: un literal como [[[...]]] anida tantos ArrayType como niveles tenga
+    def __str__(self):
+        t, dims = self, 0
+        while isinstance(t, ArrayType):
+            t, dims = t.elem, dims + 1
+        return str(t) + "[]" * dims
+
+    def __repr__(self):
+        return f"ArrayType(elem={self.elem!r})"
 
-@dataclass
 class ClassType(Type):
-    name: str
-    def is_compatible(self, other: 'Type') -> bool:
-        return isinstance(other, ClassType) and self.name == other.name
+    __slots__ = ("name", "__weakref__")
+    _interned: 'WeakValueDictionary[str, ClassType]' = WeakValueDictionary()
+
+    def __new__(cls, name: str):
+        t = cls._interned.get(name)
+        if t is None:
+            t = object.__new__(cls)
+            t.name = name
+            t = cls._interned.setdefault(name, t)
+        return t
+
+    def __reduce__(self):
+        return (ClassType, (self.name,))
+
     def __str__(self): return self.name
 
+    def __repr__(self):
+        return f"ClassType(name={self.name!r})"
+
+def array_of(elem: Type, dims: int = 1) -> Type:
+    for _ in range(dims):
+        elem = ArrayType(elem)
+    return elem
+
 # Helpers
 INT = IntegerType()
 FLOAT = FloatType()
@@ -36,6 +98,46 @@ STR = StringType()
 BOOL = BooleanType()
 NULL = NullType()
 
+BUILTIN_TYPES = {"integer": INT, "float": FLOAT, "string": STR, "boolean": BOOL, "null": NULL}
+
+# Caché de anotaciones: (tipo base, dimensiones) -> Type, compartida por todos los
+# checkers del proceso; bench/bench_annotations.py muestra su tasa de aciertos. Se vacía
+# al llegar a ANNOTATION_CACHE_SIZE entradas para no retener para siempre los tipos de
+# clase de programas ya descartados. La compatibilidad no necesita caché: con tipos
+# internados ya es una comparación por identidad.
+ANNOTATION_CACHE_SIZE = 4096
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self):
+        return f"{self.hits} aciertos, {self.misses} fallos ({self.hit_rate:.1%})"
+
+annotation_stats = CacheStats()
+_annotations: Dict[Tuple[str, int], Type] = {}
+
+def type_from_annotation(base: str, dims: int = 0) -> Type:
+    """Tipo de una anotación `base[]...[]` con `dims` pares de corchetes."""
+    key = (base, dims)
+    t = _annotations.get(key)
+    if t is not None:
+        annotation_stats.hits += 1
+        return t
+    annotation_stats.misses += 1
+    if len(_annotations) >= ANNOTATION_CACHE_SIZE:
+        _annotations.clear()
+    elem = BUILTIN_TYPES.get(base)
+    if elem is None:
+        elem = ClassType(base)
+    return _annotations.setdefault(key, array_of(elem, dims))
+
 BIN_NUMERIC = { '+', '-', '*', '/' }
 BIN_LOGICAL = { '&&', '||' }
 UNARY_LOGICAL = { '!' }
@@ -0,0 +1,119 @@
+from types import GeneratorType
+
+from antlr4 import ParseTreeVisitor
+from antlr4.tree.Tree import ErrorNode, TerminalNode
+
+# Recorrido con pila explícita para visitantes de árboles profundos.
+#
+# Con el ParseTreeVisitor normal cada visitX llama a self.visit(hijo), y un nivel de
+# paréntesis en Compiscript son ~12 reglas anidadas (expression -> assignmentExpr ->
+# conditionalExpr -> ... -> primaryExpr), o sea ~12 frames de Python. Aquí los visitX
+# son generadores: en vez de llamar a visit hacen `t = yield hijo`, y visit() los
+# ejecuta en un bucle con una lista de generadores suspendidos como pila. Un visitX que
+# no es generador (visitTerminal, por ejemplo) devuelve su valor directamente.
+#
+# El despacho no pasa por accept(): cada clase de nodo se resuelve una sola vez a su
+# visitX (o visitChildren/visitTerminal) en una tabla por clase de visitante, y
+# visitChildren salta los terminales cuyo tipo de token está en SKIP_TOKEN_TYPES.
+#
+# Si node_results no es None, visit() anota ahí id(nodo) -> resultado de cada nodo
+# visitado cuyo resultado no sea None, para que otras pasadas lo lean sin re-visitar.
+
+
+class StackVisitor(ParseTreeVisitor):
+    # Tipos de token cuyo visitTerminal no aporta nada (puntuación, palabras clave)
+    SKIP_TOKEN_TYPES = frozenset()
+    node_results = None
+
+    @classmethod
+    def _dispatch_table(cls):
+        table = cls.__dict__.get("_handlers")
+        if table is None:
+            table = {}
+            setattr(cls, "_handlers", table)
+        return table
+
+    @classmethod
+    def _resolve_handler(cls, node_cls):
+        """Mismo criterio que el accept() generado: visitX si existe, si no visitChildren."""
+        if issubclass(node_cls, ErrorNode):
+            return cls.visitErrorNode
+        if issubclass(node_cls, TerminalNode):
+            return cls.visitTerminal
+        name = node_cls.__name__
+        if name.endswith("Context"):
+            return getattr(cls, "visit" + name[:-len("Context")], cls.visitChildren)
+        return cls.visitChildren
+
+    def visit(self, tree):
+        if self.node_results is not None:
+            return self._visit_recording(tree)
+        table = self._dispatch_table()
+        resolve = self._resolve_handler
+
+        handler = table.get(type(tree)) or table.setdefault(type(tree), resolve(type(tree)))
+        result = handler(self, tree)
+        if type(result) is not GeneratorType:
+            return result
+
+        stack = [result]
+        value = None
+        while stack:
+            try:
+                child = stack[-1].send(value)
+            except StopIteration as done:
+                stack.pop()
+                value = done.value
+                continue
+            handler = table.get(type(child))
+            if handler is None:
+                handler = table[type(child)] = resolve(type(child))
+            value = handler(self, child)
+            if type(value) is GeneratorType:
+                stack.append(value)
+                value = None
+        return value
+
+    def _visit_recording(self, tree):
+        """visit() con la pila como pares (generador, nodo) para anotar cada resultado."""
+        table = self._dispatch_table()
+        resolve = self._resolve_handler
+        results = self.node_results
+
+        node = tree
+        stack = []
+        while True:
+            handler = table.get(type(node))
+            if handler is None:
+                handler = table[type(node)] = resolve(type(node))
+            value = handler(self, node)
+            if type(value) is GeneratorType:
+                stack.append((value, node))
+                value = None
+            else:
+                if value is not None:
+                    results[id(node)] = value
+            while stack:
+                gen, owner = stack[-1]
+                try:
+                    node = gen.send(value)
+                    break
+                except StopIteration as done:
+                    stack.pop()
+                    value = done.value
+                    if value is not None:
+                        results[id(owner)] = value
+            else:
+                return value
+
+    def visitChildren(self, node):
+        result = self.defaultResult()
+        children = node.children
+        if not children:
+            return result
+        skip = self.SKIP_TOKEN_TYPES
+        for child in children:
+            if skip and isinstance(child, TerminalNode) and child.symbol.type in skip:
+                continue
+            result = self.aggregateResult(result, (yield child))
+        return result
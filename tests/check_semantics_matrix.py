@@ -1,32 +1,25 @@
 # tests/check_semantics_matrix.py
 import os, sys, re
-from antlr4 import InputStream, CommonTokenStream
+from antlr4 import InputStream
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 # Ajusta si tu árbol de carpetas difiere
 sys.path.append(os.path.join(ROOT, "program"))
 sys.path.append(os.path.join(ROOT, "src"))
 
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-from semantics.errors import SyntaxErrorListener
-from semantics.checker import SemanticChecker
+from semantics.parsing import PREDICTION_LL, PREDICTION_MODES
+from semantics.session import CompilerSession
+
+# Modo de predicción del parser; se puede pasar como argumento: ll | two-stage
+PREDICTION = sys.argv[1] if len(sys.argv) > 1 else PREDICTION_LL
+SESSION = CompilerSession(PREDICTION) if PREDICTION in PREDICTION_MODES else None
 
 def run_semantic(code: str):
-    input_stream = InputStream(code)
-    lexer = CompiscriptLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = CompiscriptParser(tokens)
-    syn = SyntaxErrorListener()
-    parser.removeErrorListeners()
-    parser.addErrorListener(syn)
-    tree = parser.program()
-    if getattr(syn, "has_errors", False):
-        return ("syntax", syn.errors)
-
-    checker = SemanticChecker()
-    checker.visit(tree)
-    errs = getattr(checker, "errors", [])
+    result = SESSION.compile(InputStream(code))
+    if result.syntax_errors:
+        return ("syntax", result.syntax_errors)
+
+    errs = result.semantic_errors
     return ("ok" if not errs else "semerr", errs)
 
 def assert_expect(name, code, expect_ok: bool):
@@ -61,6 +54,8 @@ def expect_same_result_under_rename(name, code, mapping):
     return True
 
 def main():
+    if PREDICTION not in PREDICTION_MODES:
+        sys.exit(f"Modo de predicción desconocido: {PREDICTION}")
     passed, failed = 0, 0
 
     def check(name, code, ok):
@@ -0,0 +1,97 @@
+# tests/test_lexer.py
+# Prueba diferencial: RegexLexer contra el CompiscriptLexer generado por ANTLR, sobre los
+# ejemplos de samples/, programas generados y entradas aleatorias (incluye errores
+# léxicos). Compara el token stream completo (tipo, canal, start/stop, línea, columna,
+# texto, índice) y los errores 'token recognition error'. También compara las vistas de
+# semantics.tokens.ArrayTokenStream con los CommonToken de CommonTokenStream.
+
+import random
+import sys
+from pathlib import Path
+
+from antlr4 import CommonTokenStream, InputStream
+from antlr4.error.ErrorListener import ErrorListener
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT / "program"))
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "bench"))
+
+from semantics.lexer import LEXER_ANTLR, LEXER_MODES, LEXER_REGEX, create_lexer
+from semantics.tokens import ArrayTokenStream
+from CompiscriptLexer import CompiscriptLexer
+from corpus import generate_program
+
+GREEN = "\033[92m"
+RED   = "\033[91m"
+RESET = "\033[0m"
+
+# Fragmentos para las entradas aleatorias: tokens válidos, prefijos de tokens (comillas,
+# '|', '&', '/*' sin cerrar, '1.'), saltos de línea y caracteres que ninguna regla acepta
+FRAGMENTS = [lit[1:-1] for lit in CompiscriptLexer.literalNames if lit.startswith("'")] + [
+    "x", "_a1", "letx", "classy", "0", "42", "3.14", "1.", ".5", "007",
+    '"s"', '""', '"abc', '"', "|", "&", "/", "*", "//c", "/*", "*/", "/* c */", "/*/",
+    " ", "  ", "\t", "\n", "\r\n", "\r", "@", "#", "$", "ñ", "é", "😀", "\\", "'", "~", "^",
+]
+
+
+class _Collect(ErrorListener):
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def lex(kind: str, code: str, compact: bool = False):
+    """(tokens, errores) de lexear `code` con el lexer `kind` a través de un CommonTokenStream
+    o, con compact=True, de un ArrayTokenStream."""
+    lexer = create_lexer(kind, InputStream(code))
+    listener = _Collect()
+    lexer.removeErrorListeners()
+    lexer.addErrorListener(listener)
+    stream = ArrayTokenStream(lexer) if compact else CommonTokenStream(lexer)
+    stream.fill()
+    tokens = [stream.get(i) for i in range(len(stream.columns))] if compact else stream.tokens
+    tokens = [(t.type, t.channel, t.start, t.stop, t.line, t.column, t.text, t.tokenIndex)
+              for t in tokens]
+    return tokens, listener.errors
+
+
+def same_tokens(code: str) -> bool:
+    expected = lex(LEXER_ANTLR, code)
+    return lex(LEXER_REGEX, code) == expected and all(lex(kind, code, compact=True) == expected
+                                                      for kind in LEXER_MODES)
+
+
+def fuzz_inputs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+
+
+def check_lexer(n_fuzz: int):
+    samples = sorted((ROOT / "samples").glob("*.cps")) + [ROOT / "program" / "program.cps"]
+    for path in samples:
+        yield f"lexer/{path.name}", same_tokens(path.read_text(encoding="utf-8"))
+    yield "lexer/corpus", same_tokens(generate_program(200, seed=3, with_errors=True))
+    yield "lexer/vacío", same_tokens("")
+    failures = [code for code in fuzz_inputs(n_fuzz) if not same_tokens(code)]
+    for code in failures[:5]:
+        print(f"   -> distinto: {code!r}")
+    yield f"lexer/aleatorio ({n_fuzz} entradas)", not failures
+
+
+def run(n_fuzz: int = 2000):
+    passed = failed = 0
+    for name, ok in check_lexer(n_fuzz):
+        passed, failed = passed + ok, failed + (not ok)
+        print(f"{GREEN}PASS{RESET}: {name}" if ok else f"{RED}FAIL{RESET}: {name}")
+    print(f"\nResumen: {passed} PASS, {failed} FAIL")
+    return failed
+
+
+if __name__ == "__main__":
+    # Uso: python test_lexer.py [entradas aleatorias]
+    sys.exit(1 if run(int(sys.argv[1]) if len(sys.argv) > 1 else 2000) else 0)
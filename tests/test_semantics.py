@@ -2,11 +2,19 @@
 # Cobertura amplia para Compiscript: tipos, ámbitos, funciones, control de flujo,
 # clases/objetos, listas/índices y reglas generales de la rúbrica.
 
+import gc
+import inspect
+import re
+import marshal
 import os
+import pickle
+import subprocess
+import tempfile
+import threading
 from pathlib import Path
 from typing import List, Tuple
 
-from antlr4 import InputStream, CommonTokenStream
+from antlr4 import InputStream
 from antlr4.error.ErrorListener import ErrorListener
 
 # Rutas para importar el lexer/parser y el checker
@@ -15,30 +23,27 @@ import sys
 sys.path.append(str(ROOT / "program"))
 sys.path.append(str(ROOT / "src"))
 
-from CompiscriptLexer import CompiscriptLexer
-from CompiscriptParser import CompiscriptParser
-from semantics.errors import SyntaxErrorListener
-from semantics.checker import SemanticChecker
+from semantics import dfacache
+from semantics import batch
+from semantics.batch import check_file, check_files, expand_inputs
+from semantics.mmapstream import open_stream
+from semantics.parsing import PREDICTION_LL, PREDICTION_MODES
+from semantics.incremental import IncrementalChecker
+from semantics.lexer import LEXER_MODES
+from semantics.parallel import check_parallel
+from semantics.resultcache import ResultCache
+from semantics import types
+from semantics.types import INT, ArrayType, ClassType, IntegerType, array_of, type_from_annotation
+from semantics.session import CompilerSession
 
+# Una sesión por modo de predicción, reutilizada por todos los casos
+SESSIONS = {mode: CompilerSession(mode) for mode in PREDICTION_MODES}
 
-def parse_and_check(code: str) -> Tuple[List[str], List[str]]:
-    """Devuelve (syntax_errors, semantic_errors)"""
-    input_stream = InputStream(code)
-    lexer = CompiscriptLexer(input_stream)
-    tokens = CommonTokenStream(lexer)
-    parser = CompiscriptParser(tokens)
 
-    syn = SyntaxErrorListener()
-    parser.removeErrorListeners()
-    parser.addErrorListener(syn)
-
-    tree = parser.program()
-    if syn.has_errors:
-        return syn.errors, []
-
-    checker = SemanticChecker()
-    checker.visit(tree)
-    return [], checker.errors
+def parse_and_check(code: str, prediction: str = PREDICTION_LL) -> Tuple[List[str], List[str]]:
+    """Devuelve (syntax_errors, semantic_errors) ya formateados"""
+    result = SESSIONS[prediction].compile(InputStream(code))
+    return [str(e) for e in result.syntax_errors], [str(e) for e in result.semantic_errors]
 
 
 # ------------------------------
@@ -56,6 +61,16 @@ let b: float = 2.5 * 4 - 1.0;
 let a: integer = true + 3;
 """, ["Suma/resta requiere", "operandos numéricos"]),
 
+("tipos/aritmetica_cadena_ok", "OK", """
+let a: integer = 1 + 2 - 3 + 4 * 5 * 6 % 7;
+let b: float = 1 + 2 + 3 + 0.5;
+""", []),
+
+("tipos/aritmetica_cadena_err", "ERR", """
+let a: integer = 1 + 2 + "x";
+let b: integer = 1 + 2 + 0.5;
+""", ["Suma/resta requiere", "variable 'b' es integer pero expresión es float"]),
+
 ("tipos/logica_ok", "OK", """
 let a: boolean = true && (false || !false);
 """, []),
@@ -115,6 +130,19 @@ let x: integer = xs[0];
 let xs: integer[] = [1, true];
 """, ["Arreglo con elementos de tipos incompatibles"]),
 
+("listas/literales_ok", "OK", """
+let a: integer = 7;
+let xs: integer[] = [1, 2, a, -3, (4), 5 * 6];
+let ss: string[] = ["a", "b"];
+let bs: boolean[] = [true, false, a > 1];
+""", []),
+
+("listas/literales_err", "ERR", """
+let a: float = 1.5;
+let xs: integer[] = [1, 2, 3.0, 4];
+let ys: integer[] = [1, 2, a];
+""", ["Arreglo con elementos de tipos incompatibles", "Asignación incompatible: variable 'ys'"]),
+
 ("listas/indice_tipo_err", "ERR", """
 let xs: integer[] = [1,2,3];
 let a: integer = xs[true];
@@ -300,12 +328,12 @@ def ensure_samples():
                 pass
     print(f"Se generaron ejemplos en: {outdir}")
 
-def run():
+def run(prediction: str = PREDICTION_LL):
     ensure_samples()
     passed = 0
     failed = 0
     for name, expect, code, must in CASES:
-        syn, sem = parse_and_check(code)
+        syn, sem = parse_and_check(code, prediction)
         ok = True
         detail_lines = []
 
@@ -330,8 +358,390 @@ def run():
             for e in (sem if sem else syn):
                 print(f"   -> {e}")
 
+    for name, ok in [*check_max_errors(prediction), *check_parallel_bodies(prediction),
+                     *check_incremental(prediction), *check_side_tables(prediction),
+                     *check_file_input(prediction), *check_compact_tokens(prediction),
+                     *check_lazy_imports(), *check_lexer_errors(prediction),
+                     *check_recursion_limit(prediction), *check_interning(), *check_annotation_cache(),
+                     *check_dfa_cache(prediction), *check_batch(prediction), *check_streaming(prediction),
+                     *check_syntax_only(prediction), *check_chain_error_order(prediction)]:
+        passed, failed = passed + ok, failed + (not ok)
+        print(f"{GREEN}PASS{RESET}: {name}" if ok else f"{RED}FAIL{RESET}: {name}")
+
     print(f"\nResumen: {passed} PASS, {failed} FAIL")
 
 
+def check_max_errors(prediction: str):
+    """max_errors corta el análisis en el tope exacto, sintáctico y semántico, y truncated
+    queda en True solo si había más errores que el tope (también en paralelo, incremental,
+    check_file y la caché de resultados)."""
+    cases = [
+        ("max_errors/semantico", "".join(f"x{i} = 1;\n" for i in range(50)), "semantic_errors"),
+        ("max_errors/sintactico", "let a = ;\n" * 50, "syntax_errors"),
+    ]
+    for name, code, attr in cases:
+        for stream in (False, True):
+            session = CompilerSession(prediction, stream=stream, max_errors=5)
+            errors = getattr(session.compile(InputStream(code)), attr)
+            yield f"{name}{'/stream' if stream else ''}", len(errors) == 5
+
+            # 50 errores reales: con tope 50 no hay corte; con 49 sí
+            results = [CompilerSession(prediction, stream=stream, max_errors=cap).compile(InputStream(code))
+                       for cap in (5, 49, 50)]
+            yield (f"{name}/truncated{'/stream' if stream else ''}",
+                   [r.truncated for r in results] == [True, True, False]
+                   and [len(getattr(r, attr)) for r in results] == [5, 49, 50])
+    code = cases[1][1]
+    results = [CompilerSession(prediction, syntax_only=True, max_errors=cap).compile(InputStream(code))
+               for cap in (49, 50)]
+    yield "max_errors/truncated/syntax-only", [r.truncated for r in results] == [True, False]
+
+    # Cuerpos de funciones aparte: el tope y el corte se deciden sobre la lista intercalada
+    code = "".join(f"function f{i}() {{ print(y{i}); }}\nz{i} = 1;\n" for i in range(10))
+    expected = CompilerSession(prediction).compile_source(code).semantic_errors
+    for cap in (5, 19, 20):
+        reference = CompilerSession(prediction, max_errors=cap).compile_source(code)
+        for name, result in (("paralelo", check_parallel(code, 1, prediction, cap)),
+                             ("incremental", IncrementalChecker(prediction, cap).check(code))):
+            yield (f"max_errors/truncated/{name}/{cap}",
+                   len(expected) == 20 and result.truncated == reference.truncated == (cap < 20)
+                   and [str(e) for e in result.semantic_errors] == [str(e) for e in reference.semantic_errors])
+
+    # check_file y la caché de resultados guardan el flag
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "errores.cps")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(cases[0][1])
+        cache = ResultCache(os.path.join(tmp, "cache"))
+        for cap in (49, 50):
+            session = CompilerSession(prediction, max_errors=cap)
+            first, second = check_file(session, path, cache), check_file(session, path, cache)
+            yield (f"max_errors/truncated/check_file/{cap}",
+                   not first.cached and second.cached and first.truncated == second.truncated == (cap < 50))
+
+
+
+def check_parallel_bodies(prediction: str):
+    """check_parallel (cuerpos de funciones aparte, en el proceso o en un pool) da los
+    mismos diagnósticos que compile()."""
+    def same(code, jobs):
+        result = check_parallel(code, jobs, prediction)
+        return parse_and_check(code, prediction) == ([str(e) for e in result.syntax_errors],
+                                                     [str(e) for e in result.semantic_errors])
+
+    yield "paralelo/casos", all(same(code, 1) for _, _, code, _ in CASES)
+    code = "".join(f"function f{i}(a: integer): integer {{ return f{i + 1}(a) + g; }}\nlet g: integer = {i};\n"
+                   for i in range(20))
+    yield "paralelo/pool", same(code, 2)
+
+
+def check_incremental(prediction: str):
+    """IncrementalChecker sobre ediciones sucesivas: mismos diagnósticos que compile() y
+    solo se re-chequean los cuerpos afectados."""
+    versions = [
+        "function f(): integer { return g; }\nclass A { let x: integer; function m(): integer { return this.x; } }\n",
+        "let g: integer = 1;\nfunction f(): integer { return g; }\nclass A { let x: integer; function m(): integer { return this.x; } }\n",
+        "let g: integer = 1;\nfunction f(): integer { return g; }\nclass A { let x: string; function m(): integer { return this.x; } }\n",
+        "let g: integer = 1;\nfunction f(): integer { return g; }\nclass A { let x: string; function m(): string { return this.x; } }\n",
+    ]
+    expected_checked = [2, 1, 1, 1]
+    checker = IncrementalChecker(prediction)
+    for i, (code, checked) in enumerate(zip(versions, expected_checked)):
+        result = checker.check(code)
+        same = parse_and_check(code, prediction)[1] == [str(e) for e in result.semantic_errors]
+        yield f"incremental/version{i}", same and checker.stats.checked == checked
+
+
+def check_side_tables(prediction: str):
+    """Con side_tables=True el checker guarda el tipo de cada expresión y el símbolo de
+    cada identificador, consultables sobre el árbol."""
+    code = "let n: integer = 2;\nlet r = n * 1.5;\n"
+    result = CompilerSession(prediction, side_tables=True).compile_source(code)
+    init = result.tree.statement(1).variableDeclaration().initializer().expression()
+    nodes, ident = [init], None
+    while nodes and ident is None:
+        node = nodes.pop()
+        nodes.extend(getattr(node, "children", None) or [])
+        if node.getChildCount() == 0 and node.getText() == "n":
+            ident = node
+    yield "tablas/tipo", not result.errors and str(result.checker.type_of(init)) == "float"
+    sym = result.checker.symbol_of(ident) if ident is not None else None
+    yield "tablas/símbolo", sym is not None and sym.name == "n" and str(sym.type) == "integer"
+    plain = CompilerSession(prediction).compile_source(code).checker
+    yield "tablas/desactivadas", plain.node_symbols is None
+    failures = 0
+    for query in (plain.type_of, plain.symbol_of):
+        try:
+            query(init)
+        except RuntimeError as ex:
+            failures += "side_tables=True" in str(ex)
+    yield "tablas/desactivadas_error", failures == 2
+
+
+def check_file_input(prediction: str):
+    """compile_file (archivo mapeado con mmap) da lo mismo que compile_source, con y sin
+    caracteres no ASCII."""
+    session = SESSIONS[prediction]
+    sources = [("ascii", 'let x: integer = "a";\n'),
+               ("utf8", 'let s: string = "ñandú 😀";\nlet x: integer = s;\n'),
+               ("vacío", "")]
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, code in sources:
+            path = Path(tmp) / f"{name}.cps"
+            path.write_text(code, encoding="utf-8")
+            got = [str(e) for e in session.compile_file(str(path)).errors]
+            yield f"archivo/{name}", got == [str(e) for e in session.compile_source(code).errors]
+            with open_stream(str(path)) as stream:
+                pass
+            yield f"archivo/{name}/close", getattr(stream.buffer, "closed", True)
+
+        # check_file cierra el mmap al terminar, con y sin caché
+        opened = []
+        def recording_open(p):
+            opened.append(open_stream(p))
+            return opened[-1]
+        batch.open_stream = recording_open
+        try:
+            path = str(Path(tmp) / "ascii.cps")
+            cache = ResultCache(str(Path(tmp) / "cache"))
+            results = [check_file(session, path), check_file(session, path, cache), check_file(session, path, cache)]
+        finally:
+            batch.open_stream = open_stream
+        yield "archivo/check_file_cierra", (len(opened) == 3 and all(s.buffer.closed for s in opened)
+                                            and results[2].cached and results[2].errors == results[0].errors)
+
+
+def check_compact_tokens(prediction: str):
+    """Con compact_tokens=True (tokens en columnas) los diagnósticos son los mismos, con
+    ambos lexers, en modo normal y streaming y con errores sintácticos."""
+    def diagnostics(session, code):
+        result = session.compile(InputStream(code))
+        return [str(e) for e in result.syntax_errors], [str(e) for e in result.semantic_errors]
+
+    codes = [code for _, _, code, _ in CASES] + [
+        "let a = ;\nlet b: integer = \"x\" + ;\n",
+        "function f( { return 1 }\nclass { }\nlet x: integer = [1, 2][0] + g;\n",
+    ]
+    for lexer in LEXER_MODES:
+        for stream in (False, True):
+            compact = CompilerSession(prediction, stream=stream, lexer=lexer, compact_tokens=True)
+            common = CompilerSession(prediction, stream=stream, lexer=lexer)
+            same = all(diagnostics(compact, code) == diagnostics(common, code) for code in codes)
+            yield f"tokens_compactos/{lexer}{'/stream' if stream else ''}", same
+
+
+def check_lazy_imports():
+    """Importar Driver.py (o los módulos de semantics que usa) no carga el pool de procesos
+    ni los módulos de -j / --watch: un chequeo de un solo archivo no paga ese arranque."""
+    lazy = ("concurrent.futures", "multiprocessing", "src.semantics.parallel",
+            "src.semantics.incremental")
+    for name, module in (("batch", "semantics.batch"), ("parallel", "semantics.parallel"),
+                         ("driver", "Driver")):
+        code = (f"import sys; sys.path[:0] = sys.argv[1:]\nimport {module}\n"
+                f"print([m for m in {lazy!r} if m in sys.modules])")
+        out = subprocess.run([sys.executable, "-c", code, str(ROOT / "src"), str(ROOT / "program")],
+                             capture_output=True, text=True).stdout.strip()
+        yield f"arranque/{name}_sin_pool", out == "[]"
+
+
+def check_lexer_errors(prediction: str):
+    """Los errores léxicos son errores sintácticos del resultado (no van a stderr), así que
+    un archivo que sale de la caché reporta los mismos que la primera vez."""
+    code = "let a: integer = 1 @ 2;\nlet b: integer = 3;\n"
+    errors = [str(e) for e in SESSIONS[prediction].compile_source(code).syntax_errors]
+    yield "lexico/en_resultado", any("token recognition error at: '@'" in e for e in errors)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "lexico.cps"
+        path.write_text(code, encoding="utf-8")
+        cache = ResultCache(str(Path(tmp) / "cache"))
+        first = check_file(SESSIONS[prediction], str(path), cache)
+        second = check_file(SESSIONS[prediction], str(path), cache)
+    yield "lexico/cache", second.cached and second.errors == first.errors == errors
+
+
+def check_recursion_limit(prediction: str):
+    """El límite de recursión se sube solo mientras se parsea y después vuelve al de antes,
+    también con varios hilos compilando a la vez."""
+    session = CompilerSession(prediction)
+    code = "let d = " + "(" * 500 + "1" + ")" * 500 + ";\n"
+    limit = sys.getrecursionlimit()
+    ok = not session.compile_source(code).errors
+    yield "recursion/restaurado", ok and sys.getrecursionlimit() == limit
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(session.compile_source(code).ok))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    yield "recursion/hilos", results == [True] * 4 and sys.getrecursionlimit() == limit
+
+
+def check_interning():
+    """Los tipos están internados: el mismo tipo construido dos veces (o de vuelta de pickle,
+    como en semantics.parallel) es el mismo objeto, y los que nadie usa se liberan."""
+    point = ClassType("Punto")
+    matrix = array_of(point, 2)
+    yield "tipos/internados", (IntegerType() is INT and ArrayType(INT) is ArrayType(INT)
+                               and ClassType("Punto") is point and ArrayType(ArrayType(ClassType("Punto"))) is matrix)
+    yield "tipos/pickle", all(pickle.loads(pickle.dumps(t)) is t
+                              for t in (INT, ArrayType(INT), point, matrix))
+    ClassType("Temporal_internado")
+    gc.collect()
+    yield "tipos/debiles", "Temporal_internado" not in ClassType._interned and "Punto" in ClassType._interned
+
+
+def check_annotation_cache():
+    """type_from_annotation devuelve el mismo tipo para la misma clave (base, dims), cuenta
+    aciertos y fallos y no crece más allá de ANNOTATION_CACHE_SIZE."""
+    stats = types.annotation_stats
+    hits, misses = stats.hits, stats.misses
+    first = type_from_annotation("Cache_prueba", 2)
+    again = type_from_annotation("Cache_prueba", 2)
+    yield "anotaciones/stats", (stats.misses, stats.hits) == (misses + 1, hits + 1)
+    yield "anotaciones/misma_clave", first is again and first is array_of(ClassType("Cache_prueba"), 2)
+    yield "anotaciones/builtin", type_from_annotation("integer", 1) is ArrayType(INT)
+    for i in range(types.ANNOTATION_CACHE_SIZE + 10):
+        type_from_annotation(f"Cache_relleno{i}")
+    yield "anotaciones/acotada", (len(types._annotations) <= types.ANNOTATION_CACHE_SIZE
+                                  and type_from_annotation("integer", 2) is array_of(INT, 2))
+
+
+def check_dfa_cache(prediction: str):
+    """El snapshot de DFA sobrevive save/load con los mismos diagnósticos; uno de otra
+    gramática o formato, truncado o basura se ignora sin lanzar."""
+    def clear():
+        for cls, _, _ in dfacache._recognizers():
+            for dfa in cls.decisionsToDFA:
+                dfa.states.clear()
+                dfa.s0 = None
+
+    def loads(path):
+        try:
+            return dfacache.load(path)
+        except Exception:
+            return None
+
+    codes = [code for _, _, code, _ in CASES]
+    expected = [parse_and_check(code, prediction) for code in codes]
+    with tempfile.TemporaryDirectory() as tmp:
+        good = os.path.join(tmp, "dfa.bin")
+        saved = dfacache.save(good, force=True)
+        states = dfacache.state_count()
+        clear()
+        loaded = dfacache.load(good)
+        yield "dfa/ida_y_vuelta", saved and states > 0 and loaded == states == dfacache.state_count()
+        yield "dfa/diagnosticos", [parse_and_check(code, prediction) for code in codes] == expected
+
+        with open(good, "rb") as f:
+            raw = f.read()
+        version, key, lexer_data, parser_data = marshal.loads(raw)
+        bad = {
+            "otra_gramatica": marshal.dumps((version, "0" * 64, lexer_data, parser_data)),
+            "otro_formato": marshal.dumps((version + 1, key, lexer_data, parser_data)),
+            "truncado": raw[:len(raw) // 2],
+            "basura": b"\x00basura" * 10,
+        }
+        for name, data in bad.items():
+            path = os.path.join(tmp, name + ".bin")
+            with open(path, "wb") as f:
+                f.write(data)
+            clear()
+            yield f"dfa/{name}", loads(path) == 0 and dfacache.state_count() == 0
+        yield "dfa/por_version_python", dfacache.runtime_tag() in dfacache.default_path()
+        clear()
+        dfacache.load(good)
+
+
+def check_batch(prediction: str):
+    """expand_inputs ordena y quita duplicados entre directorios, globs y rutas explícitas;
+    check_files con jobs=2 conserva el orden y un archivo faltante es un io_error del
+    archivo; el código de salida de Driver.py en modo batch refleja si algo falló."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "sub").mkdir()
+        files = {"a.cps": "let a: integer = 1;\n", "sub/b.cps": 'let b: integer = "x";\n',
+                 "sub/c.cps": "let c: string = \"c\";\n", "notas.txt": "no es Compiscript\n"}
+        for name, code in files.items():
+            (root / name).write_text(code, encoding="utf-8")
+        a, b, c, missing = (str(root / n) for n in ("a.cps", "sub/b.cps", "sub/c.cps", "falta.cps"))
+
+        paths = expand_inputs([tmp, str(root / "sub" / "*.cps"), a, missing])
+        yield "batch/expand_inputs", paths == [a, b, c, missing]
+
+        results = list(check_files(paths, jobs=2, prediction=prediction, dfa_cache=False))
+        yield "batch/orden", [r.path for r in results] == paths
+        yield "batch/resultados", ([r.ok for r in results] == [True, False, True, False]
+                                   and results[3].io_error is not None and results[1].io_error is None)
+
+        def exit_code(*inputs):
+            return subprocess.run([sys.executable, str(ROOT / "program" / "Driver.py"), *inputs,
+                                   "--no-cache", "--no-dfa-cache", "-j", "2", "--prediction", prediction],
+                                  capture_output=True, text=True).returncode
+        yield "batch/salida_ok", exit_code(a, c) == 0
+        yield "batch/salida_error", exit_code(tmp) == 1 and exit_code(a, missing) == 1
+
+
+def check_streaming(prediction: str):
+    """stream=True da los mismos diagnósticos que compilar el archivo entero, y los estados
+    ATN que usa iter_program coinciden con los del CompiscriptParser.program() generado."""
+    from CompiscriptParser import CompiscriptParser
+    from semantics import parsing
+    generated = [int(n) for n in re.findall(r"self\.state = (\d+)", inspect.getsource(CompiscriptParser.program))]
+    yield "stream/estados_atn", generated == [parsing._PROGRAM_LOOP, parsing._PROGRAM_STATEMENT,
+                                              parsing._PROGRAM_NEXT, parsing._PROGRAM_EOF]
+
+    def diagnostics(session, code):
+        result = session.compile(InputStream(code))
+        return [str(e) for e in result.syntax_errors], [str(e) for e in result.semantic_errors]
+
+    codes = [code for _, _, code, _ in CASES] + [
+        "let a = ;\nlet b: integer = 1;\nlet c: integer = \"x\";\n",
+        "let x: integer = 1;\nfunction f( { }\nx = 2;\n",
+        "let y = 1 +;\n}\nprint(y);\n",
+    ]
+    whole, streaming = CompilerSession(prediction), CompilerSession(prediction, stream=True)
+    different = [code for code in codes if diagnostics(whole, code) != diagnostics(streaming, code)]
+    yield "stream/igual_que_entero", not different
+
+
+def check_syntax_only(prediction: str):
+    """syntax_only=True (check_syntax, sin árbol) da los mismos errores sintácticos que
+    compile(), nunca corre el checker, respeta max_errors y va en la clave de la caché."""
+    full, lint = SESSIONS[prediction], CompilerSession(prediction, syntax_only=True)
+    codes = [code for _, _, code, _ in CASES] + [
+        "let a = ;\nlet b: integer = 1;\n",
+        "function f( { }\nclass { }\n",
+        "let y = 1 +;\n}\nprint(y);\n",
+    ]
+    same = all([str(e) for e in lint.compile(InputStream(code)).syntax_errors]
+               == [str(e) for e in full.compile(InputStream(code)).syntax_errors] for code in codes)
+    yield "sintaxis/igual_que_compile", same and any(lint.check_syntax(InputStream(c)) for c in codes[-3:])
+
+    wrong = 'let x: integer = "texto";\nundeclared = 1;\n'
+    result = lint.compile(InputStream(wrong))
+    yield "sintaxis/sin_checker", (result.ok and result.checker is None and result.tree is None
+                                   and bool(full.compile(InputStream(wrong)).semantic_errors))
+
+    capped = CompilerSession(prediction, syntax_only=True, max_errors=5)
+    yield "sintaxis/max_errors", len(capped.compile(InputStream("let a = ;\n" * 50)).syntax_errors) == 5
+    yield "sintaxis/clave_cache", "syntax-only" in lint.cache_options and "syntax-only" not in full.cache_options
+
+
+def check_chain_error_order(prediction: str):
+    """En una cadena a + b + c el error del operador va después de los errores de los
+    operandos, como en el resto de los operadores binarios."""
+    code = "class A { }\nprint(new A() + ([true, x > 1]) + y);\nprint(2 * \"t\" * z);\n"
+    errors = [e.message for e in SESSIONS[prediction].compile(InputStream(code)).semantic_errors]
+    yield "cadena/orden_errores", errors == [
+        "Identificador no declarado: x", "Comparación relacional requiere números.",
+        "Identificador no declarado: y", "Suma/resta requiere operandos numéricos (integer/float).",
+        "Identificador no declarado: z", "Multiplicación/división requiere números."]
+
+
 if __name__ == "__main__":
-    run()
+    # Uso: python test_semantics.py [ll|two-stage]
+    mode = sys.argv[1] if len(sys.argv) > 1 else PREDICTION_LL
+    if mode not in PREDICTION_MODES:
+        sys.exit(f"Modo de predicción desconocido: {mode}")
+    run(mode)